@@ -0,0 +1,30 @@
+"""
+Layout of the queryable CodeQL findings history, shared by main.py (writer)
+and query_findings.py (reader) without the reader importing the function.
+
+Each run writes one Parquet file per reported severity, even when it has no
+findings, so the newest file in a partition always identifies that
+partition's latest run:
+
+    findings/date=YYYY-MM-DD/severity=<severity>/YYYY-MM-DD_HH-MM-SS.parquet
+"""
+
+import pyarrow as pa
+
+FINDINGS_DIR = "findings"
+RUN_FILE_FORMAT = "%Y-%m-%d_%H-%M-%S"  # Parquet file name, also the run's snapshot_ts
+FINDINGS_SCHEMA = pa.schema(
+    [
+        ("snapshot_ts", pa.timestamp("s")),
+        ("repository", pa.string()),
+        ("rule_id", pa.string()),
+        ("alert_number", pa.int64()),
+        ("state", pa.string()),
+        ("original_severity", pa.string()),
+        ("created_at", pa.string()),
+        ("updated_at", pa.string()),
+        ("rule_description", pa.string()),
+        ("html_url", pa.string()),
+        ("message", pa.string()),
+    ]
+)
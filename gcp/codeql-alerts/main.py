@@ -1,15 +1,56 @@
 import os
+import gzip
 import json
+import shutil
+import tempfile
 import time
+import threading
 import requests
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import pyarrow as pa
+import pyarrow.parquet as pq
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
 
+from findings_layout import FINDINGS_DIR, FINDINGS_SCHEMA, RUN_FILE_FORMAT
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Repos fetched concurrently (overridable via CODEQL_MAX_WORKERS)
+DEFAULT_MAX_WORKERS = 8
+
+# Ceiling on request rate while quota is plentiful; keeps us clear of
+# GitHub's secondary (points-per-minute) limits
+MAX_REQUESTS_PER_SECOND = 10.0
+
+# Once remaining quota drops below this fraction of the limit, requests are
+# spread evenly over the time left until x-ratelimit-reset
+LOW_QUOTA_FRACTION = 0.1
+
+# Per-repo watermarks for incremental sync, stored next to the snapshots
+SYNC_STATE_FILE = "codeql_sync_state.json"
+SYNC_STATE_VERSION = 1
+REPORTED_SEVERITIES = ("critical", "high")
+
+# A successful fetch moves a repo's watermark up to the run's start time,
+# minus this much to absorb clock skew with GitHub (re-applying a few
+# minutes of changes is harmless: alerts are upserted by number)
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# Snapshots are gzip-compressed NDJSON, one finding per line
+SNAPSHOT_SUFFIX = ".ndjson.gz"
+SNAPSHOT_CONTENT_TYPE = "application/gzip"
+
+# Resumable upload chunk size (must be a multiple of 256 KiB); bounds the
+# upload buffer regardless of snapshot size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
 
 class MaxRetriesExceededError(Exception):
     """Exception raised when max retries are exceeded."""
@@ -29,14 +70,88 @@ def log_structured(message, severity="INFO", payload=None):
     print(json.dumps(entry))  # Print to stdout is captured by Cloud Logging
 
 
-def make_github_request(url, headers, params=None, max_retries=5):
+class TokenBucket:
+    """
+    Thread-safe token bucket whose refill rate follows GitHub's rate-limit headers.
+
+    Every request takes one token. While quota is plentiful tokens refill at
+    MAX_REQUESTS_PER_SECOND; once `x-ratelimit-remaining` falls below
+    LOW_QUOTA_FRACTION of `x-ratelimit-limit`, the rate drops to
+    remaining / seconds-until-reset so the quota lasts the window. At zero
+    remaining, or after a rate-limit response, every caller is paused.
+    """
+
+    def __init__(self, rate=MAX_REQUESTS_PER_SECOND, burst=MAX_REQUESTS_PER_SECOND):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold every caller for `seconds`."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update(self, response):
+        """Retune the bucket from a response's x-ratelimit-* headers."""
+        remaining = response.headers.get("x-ratelimit-remaining")
+        limit = response.headers.get("x-ratelimit-limit")
+        reset_time = response.headers.get("x-ratelimit-reset")
+        if not (remaining and remaining.isdigit() and reset_time and reset_time.isdigit()):
+            return
+
+        remaining = int(remaining)
+        window = max(int(reset_time) - time.time(), 1)
+        if remaining == 0:
+            self.pause(window + 1)
+            return
+
+        low_water = int(limit) * LOW_QUOTA_FRACTION if limit and limit.isdigit() else 0
+        with self._lock:
+            self._refill(time.monotonic())
+            if remaining > low_water:
+                self.rate = MAX_REQUESTS_PER_SECOND
+            else:
+                self.rate = min(MAX_REQUESTS_PER_SECOND, remaining / window)
+            self.tokens = min(self.tokens, remaining)
+
+
+# One bucket per GitHub rate-limit resource (x-ratelimit-resource)
+RATE_LIMITERS = {"core": TokenBucket(), "search": TokenBucket()}
+
+
+def make_github_request(url, headers, params=None, max_retries=5, resource="core"):
     """
     Make a GitHub API request with robust rate limit handling.
     Inspiration: https://github.com/gofri/go-github-ratelimit
+
+    Requests are paced by the token bucket for `resource` ("core" or
+    "search"), so concurrent callers share one view of the quota.
     """
+    bucket = RATE_LIMITERS[resource]
     retries = 0
     while retries < max_retries:
+        bucket.acquire()
         response = requests.get(url, headers=headers, params=params)
+        bucket.update(response)
 
         if response.status_code in [200, 404]:
             return response
@@ -99,7 +214,7 @@ def make_github_request(url, headers, params=None, max_retries=5):
                 f"Rate limit hit (Status: {response.status_code}, Remaining: {remaining}). Waiting {wait_time} seconds before retry {retries + 1}/{max_retries}.",
                 severity="WARNING",
             )
-            time.sleep(wait_time + 1)  # Add buffer
+            bucket.pause(wait_time + 1)  # Add buffer; holds every worker
             retries += 1
             continue
 
@@ -160,7 +275,9 @@ def get_repos_by_topic(topic, github_token):
 
     while True:
         params["page"] = page
-        response = make_github_request(url, headers=headers, params=params)
+        response = make_github_request(
+            url, headers=headers, params=params, resource="search"
+        )
 
         if response.status_code != 200:
             log_structured(
@@ -180,12 +297,6 @@ def get_repos_by_topic(topic, github_token):
             break
         page += 1
 
-        # Throttling to avoid secondary rate limits
-        time.sleep(1)
-
-    # Cooldown after search
-    time.sleep(5)
-
     return repos
 
 
@@ -202,8 +313,6 @@ def get_all_open_alerts(repo_full_name, github_token):
     page = 1
 
     while True:
-        # Throttling for pagination
-        time.sleep(1)
         params["page"] = page
         response = make_github_request(url, headers=headers, params=params)
 
@@ -235,6 +344,176 @@ def get_all_open_alerts(repo_full_name, github_token):
     return all_alerts
 
 
+def get_alerts_since(repo_full_name, github_token, since):
+    """
+    Fetch CodeQL alerts in any state updated at or after `since` (ISO 8601).
+
+    Alerts are requested newest-update first, so paging stops at the first
+    alert older than the watermark. Closed, fixed and dismissed alerts are
+    included so they can be removed from the snapshot. Returns None on an
+    API error or when the repo's alerts can't be read (403/404), since an
+    empty list would read as "nothing changed".
+    """
+    url = f"https://api.github.com/repos/{repo_full_name}/code-scanning/alerts"
+    headers = {
+        "Authorization": f"Bearer {github_token}",
+        "Accept": "application/vnd.github.v3+json",
+    }
+    params = {
+        "tool_name": "CodeQL",
+        "sort": "updated",
+        "direction": "desc",
+        "per_page": 100,
+    }
+
+    changed = []
+    page = 1
+
+    while True:
+        params["page"] = page
+        response = make_github_request(url, headers=headers, params=params)
+
+        if response.status_code in (403, 404):
+            log_structured(
+                f"Code scanning alerts for {repo_full_name} unreadable ({response.status_code}); "
+                "dropping its watermark",
+                severity="WARNING",
+            )
+            return None
+        if response.status_code != 200:
+            log_structured(
+                f"Error fetching alert changes for {repo_full_name}: {response.text}",
+                severity="WARNING",
+            )
+            return None
+
+        data = response.json()
+        for alert in data:
+            if (alert.get("updated_at") or "") < since:
+                return changed
+            changed.append(alert)
+
+        if len(data) < 100:
+            break
+        page += 1
+
+    return changed
+
+
+def get_org_alerts(org, github_token, params, stop_before=None):
+    """
+    Stream CodeQL alerts for every repo in `org` from the org-level endpoint.
+
+    Follows Link pagination. With `stop_before` (and sort=updated, desc in
+    `params`), paging stops at the first alert updated before it. Returns
+    None if the endpoint is unavailable (e.g. the token lacks org security
+    manager/admin access).
+    """
+    url = f"https://api.github.com/orgs/{org}/code-scanning/alerts"
+    headers = {
+        "Authorization": f"Bearer {github_token}",
+        "Accept": "application/vnd.github.v3+json",
+    }
+    params = {"tool_name": "CodeQL", "per_page": 100, **params}
+
+    alerts = []
+    while url:
+        response = make_github_request(url, headers=headers, params=params)
+        if response.status_code != 200:
+            log_structured(
+                f"Org alert listing for {org} failed ({response.status_code}): {response.text}",
+                severity="WARNING",
+            )
+            return None
+
+        for alert in response.json():
+            if stop_before and (alert.get("updated_at") or "") < stop_before:
+                return alerts
+            alerts.append(alert)
+
+        # The next link already carries the query string
+        url = response.links.get("next", {}).get("url")
+        params = None
+
+    return alerts
+
+
+def fetch_repo_alerts(repos, github_token, watermarks, max_workers):
+    """
+    Fetch alerts per repo, concurrently. Returns a list aligned with `repos`.
+
+    Repos with a watermark get only the alerts changed since it (see
+    get_alerts_since); the rest get all open alerts.
+    """
+
+    def fetch(repo):
+        since = watermarks.get(repo["full_name"])
+        if since:
+            return get_alerts_since(repo["full_name"], github_token, since)
+        return get_all_open_alerts(repo["full_name"], github_token)
+
+    # map() keeps results in repo order, so output matches a sequential run
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(fetch, repos))
+
+
+def fetch_org_alerts(org, repos, github_token, watermarks, max_workers):
+    """
+    Same result as fetch_repo_alerts, built from the org-wide alert stream.
+
+    Alerts are filtered locally to the topic's repos. Repos without a
+    watermark are served from one stream of open alerts, repos with one from
+    a single updated-since stream starting at the oldest watermark. The
+    topic search spans all of GitHub, so repos owned outside `org` (which
+    the org stream never contains) are fetched per repo instead. Returns
+    None if the org endpoint cannot be used.
+    """
+    outside = [repo for repo in repos if repo["full_name"].split("/")[0].lower() != org.lower()]
+    if outside:
+        log_structured(
+            f"{len(outside)} topic repos are outside {org}; fetching them per repo: "
+            + ", ".join(repo["full_name"] for repo in outside),
+            severity="INFO",
+        )
+
+    by_repo = {repo["full_name"]: [] for repo in repos if repo not in outside}
+    new = {name for name in by_repo if not watermarks.get(name)}
+    tracked = set(by_repo) - new
+
+    if new:
+        alerts = get_org_alerts(org, github_token, {"state": "open"})
+        if alerts is None:
+            return None
+        for alert in alerts:
+            name = alert.get("repository", {}).get("full_name")
+            if name in new:
+                by_repo[name].append(alert)
+
+    if tracked:
+        oldest = min(watermarks[name] for name in tracked)
+        alerts = get_org_alerts(
+            org,
+            github_token,
+            {"sort": "updated", "direction": "desc"},
+            stop_before=oldest,
+        )
+        if alerts is None:
+            return None
+        for alert in alerts:
+            name = alert.get("repository", {}).get("full_name")
+            if name in tracked and (alert.get("updated_at") or "") >= watermarks[name]:
+                by_repo[name].append(alert)
+
+    if outside:
+        by_repo.update(
+            zip(
+                (repo["full_name"] for repo in outside),
+                fetch_repo_alerts(outside, github_token, watermarks, max_workers),
+            )
+        )
+    return [by_repo[repo["full_name"]] for repo in repos]
+
+
 def get_alert_details(alert, repo_full_name, repo_html_url):
     """Extract relevant details from an alert."""
     return {
@@ -244,6 +523,7 @@ def get_alert_details(alert, repo_full_name, repo_html_url):
         "html_url": alert.get("html_url"),
         "state": alert.get("state"),
         "created_at": alert.get("created_at"),
+        "updated_at": alert.get("updated_at"),
         "rule_id": alert.get("rule", {}).get("id"),
         "rule_description": alert.get("rule", {}).get("description"),
         "severity": alert.get("rule", {}).get("security_severity_level"),
@@ -252,43 +532,305 @@ def get_alert_details(alert, repo_full_name, repo_html_url):
     }
 
 
-def upload_to_gcs(bucket_name, filename, data):
-    """Upload data to Google Cloud Storage. Handles gs:// prefix and subdirectories."""
-    try:
+class GCSBackend:
+    """
+    Snapshot storage in a GCS bucket. Handles gs:// prefix and subdirectories.
+
+    One storage client is created per backend, i.e. per invocation.
+    """
+
+    def __init__(self, bucket_name):
         # Normalize bucket name
         if bucket_name.startswith("gs://"):
             bucket_name = bucket_name[5:]
 
         # Split bucket and prefix if exists
-        prefix = ""
+        self.prefix = ""
         if "/" in bucket_name:
-            parts = bucket_name.split("/", 1)
-            bucket_name = parts[0]
-            prefix = parts[1]
-            if prefix and not prefix.endswith("/"):
-                prefix += "/"
-
-        full_filename = f"{prefix}{filename}"
-
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(full_filename)
-        blob.upload_from_string(
-            json.dumps(data, indent=2), content_type="application/json"
+            bucket_name, self.prefix = bucket_name.split("/", 1)
+            if self.prefix and not self.prefix.endswith("/"):
+                self.prefix += "/"
+
+        self.bucket_name = bucket_name
+        self.bucket = storage.Client().bucket(bucket_name)
+
+    def describe(self, filename):
+        return f"gs://{self.bucket_name}/{self.prefix}{filename}"
+
+    def read(self, filename):
+        """Return the object's text, or None if it does not exist."""
+        try:
+            return self.bucket.blob(f"{self.prefix}{filename}").download_as_text()
+        except NotFound:
+            return None
+
+    def read_bytes(self, filename):
+        try:
+            return self.bucket.blob(f"{self.prefix}{filename}").download_as_bytes()
+        except NotFound:
+            return None
+
+    def write(self, filename, text, content_type="application/json"):
+        self.bucket.blob(f"{self.prefix}{filename}").upload_from_string(
+            text, content_type=content_type
+        )
+
+    def open_write(self, filename, content_type):
+        """Binary writer streaming to the object via a resumable upload."""
+        blob = self.bucket.blob(f"{self.prefix}{filename}", chunk_size=UPLOAD_CHUNK_SIZE)
+        return blob.open("wb", content_type=content_type)
+
+    def copy(self, source, destination):
+        """Server-side copy; the data is not downloaded or re-uploaded."""
+        self.bucket.copy_blob(
+            self.bucket.blob(f"{self.prefix}{source}"),
+            self.bucket,
+            f"{self.prefix}{destination}",
+        )
+
+
+class LocalBackend:
+    """Snapshot storage in a local directory, for testing without GCS."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def describe(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def read(self, filename):
+        try:
+            with open(self.describe(filename), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def read_bytes(self, filename):
+        try:
+            with open(self.describe(filename), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, filename, text, content_type="application/json"):
+        tmp_path = self.describe(filename) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, self.describe(filename))
+
+    @contextmanager
+    def open_write(self, filename, content_type):
+        """Binary writer that replaces `filename` only once the block succeeds.
+
+        Writes go to a dot-prefixed temp file in the same directory (which
+        Parquet dataset scans ignore), renamed over the target on close, so
+        readers never see a partial snapshot or partition file.
+        """
+        path = self.describe(filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def copy(self, source, destination):
+        shutil.copyfile(self.describe(source), self.describe(destination))
+
+
+def get_storage_backend(bucket_name, local_dir=None):
+    """Local directory backend if configured, else GCS if a bucket is set, else None."""
+    if local_dir:
+        return LocalBackend(local_dir)
+    if bucket_name:
+        return GCSBackend(bucket_name)
+    return None
+
+
+def upload_snapshot(backend, severity, timestamp, findings):
+    """
+    Stream findings to `codeql_<severity>_<timestamp>.ndjson.gz`, then copy it to `_latest`.
+
+    Records are serialized one at a time through gzip into the backend's
+    writer, so the JSON document is never built in memory, and the data is
+    uploaded once: `_latest` is a server-side copy. An empty snapshot is
+    written straight to `_latest` without a timestamped object.
+    """
+    latest = f"codeql_{severity}_latest{SNAPSHOT_SUFFIX}"
+    target = f"codeql_{severity}_{timestamp}{SNAPSHOT_SUFFIX}" if findings else latest
+    try:
+        with (
+            backend.open_write(target, SNAPSHOT_CONTENT_TYPE) as raw,
+            gzip.GzipFile(fileobj=raw, mode="wb") as out,
+        ):
+            for finding in findings:
+                out.write(json.dumps(finding).encode("utf-8") + b"\n")
+        if target != latest:
+            backend.copy(target, latest)
+        log_structured(
+            f"Uploaded {backend.describe(target)} ({len(findings)} findings)",
+            severity="INFO",
         )
-        log_structured(f"Uploaded {full_filename} to {bucket_name}", severity="INFO")
         return True
     except Exception as e:
-        log_structured(f"Failed to upload to GCS: {str(e)}", severity="ERROR")
+        log_structured(f"Failed to upload snapshot: {str(e)}", severity="ERROR")
         return False
 
 
+def write_findings_partition(backend, severity, run_time, findings):
+    """
+    Append this run's findings to the columnar history as one Parquet file.
+
+    Files are Hive-partitioned by date and severity, so trend queries only
+    read the days and severities they ask for. Rows are sorted by repository
+    and rule_id, which keeps the per-row-group statistics selective for
+    filters on those columns. A run with no findings still writes an empty
+    file, so it supersedes that day's earlier runs. See query_findings.py.
+    """
+    filename = (
+        f"{FINDINGS_DIR}/date={run_time:%Y-%m-%d}/severity={severity}/"
+        f"{run_time:{RUN_FILE_FORMAT}}.parquet"
+    )
+    rows = sorted(findings, key=lambda f: (f["repository"], f["rule_id"] or "", f["alert_number"] or 0))
+    columns = {name: [f.get(name) for f in rows] for name in FINDINGS_SCHEMA.names}
+    columns["snapshot_ts"] = [run_time.replace(microsecond=0)] * len(rows)
+    table = pa.Table.from_pydict(columns, schema=FINDINGS_SCHEMA)
+
+    try:
+        buffer = pa.BufferOutputStream()
+        pq.write_table(table, buffer, compression="zstd")
+        with backend.open_write(filename, "application/vnd.apache.parquet") as out:
+            out.write(buffer.getvalue().to_pybytes())
+        log_structured(f"Wrote {backend.describe(filename)}", severity="INFO")
+        return True
+    except Exception as e:
+        log_structured(f"Failed to write findings history: {str(e)}", severity="ERROR")
+        return False
+
+
+def read_snapshot(backend, filename):
+    """Parse an NDJSON+gzip snapshot into a list of findings, or None if it doesn't exist."""
+    data = backend.read_bytes(filename)
+    if data is None:
+        return None
+    lines = gzip.decompress(data).decode("utf-8").splitlines()
+    return [json.loads(line) for line in lines if line]
+
+
+def load_sync_state(backend):
+    """
+    Load per-repo watermarks and the current findings snapshot.
+
+    Returns ({repo: watermark}, {(repo, alert_number): details}). Both are
+    empty, forcing a full sync, when the state or either latest snapshot is
+    missing or unreadable.
+    """
+    try:
+        state = json.loads(backend.read(SYNC_STATE_FILE) or "{}")
+        if state.get("version") != SYNC_STATE_VERSION:
+            return {}, {}
+
+        snapshot = {}
+        for severity in REPORTED_SEVERITIES:
+            filename = f"codeql_{severity}_latest{SNAPSHOT_SUFFIX}"
+            findings = read_snapshot(backend, filename)
+            if findings is None:
+                log_structured(
+                    f"{filename} missing; running a full sync",
+                    severity="WARNING",
+                )
+                return {}, {}
+            for finding in findings:
+                snapshot[(finding["repository"], finding["alert_number"])] = finding
+    except Exception as e:
+        log_structured(f"Unreadable sync state ({str(e)}); running a full sync", severity="WARNING")
+        return {}, {}
+
+    return state.get("watermarks", {}), snapshot
+
+
+def save_sync_state(backend, watermarks):
+    state = {
+        "version": SYNC_STATE_VERSION,
+        "updated": datetime.now().isoformat(timespec="seconds"),
+        "watermarks": watermarks,
+    }
+    backend.write(SYNC_STATE_FILE, json.dumps(state, indent=2, sort_keys=True))
+
+
+def sync_incremental(repos, changes, watermarks, snapshot, synced_through):
+    """
+    Bring `snapshot` up to date with the alerts changed since each watermark.
+
+    `changes` is aligned with `repos`: the delta for repos with a watermark,
+    all open alerts for new repos, or None where the fetch failed. Changed
+    alerts are upserted when open and critical/high, and removed otherwise.
+    Repos that left the topic are dropped. A failed repo keeps its findings
+    for this run but loses its watermark, so the next run lists its open
+    alerts in full and replaces them (or clears them if it is unreadable).
+
+    Every repo fetched successfully has seen all changes up to
+    `synced_through` (ISO 8601, UTC), so its watermark moves at least that
+    far. Otherwise a quiet repo would pin the org-wide stream to its old
+    watermark, and a repo with no alerts would never get one.
+    Returns (critical_findings, high_findings, new_watermarks).
+    """
+    repo_order = {repo["full_name"]: i for i, repo in enumerate(repos)}
+    merged = {key: f for key, f in snapshot.items() if key[0] in repo_order}
+    new_watermarks = {}
+    changed_count = 0
+
+    for repo, alerts in zip(repos, changes):
+        full_name = repo["full_name"]
+        since = watermarks.get(full_name)
+        if alerts is None:
+            # Fetch failed or access was lost: keep previous findings for now
+            # and re-list the repo from scratch next run
+            continue
+        if not since:
+            merged = {key: f for key, f in merged.items() if key[0] != full_name}
+
+        for alert in alerts:
+            key = (full_name, alert.get("number"))
+            merged.pop(key, None)
+            severity = alert.get("rule", {}).get("security_severity_level")
+            if alert.get("state") == "open" and severity in REPORTED_SEVERITIES:
+                merged[key] = get_alert_details(alert, full_name, repo["html_url"])
+        changed_count += len(alerts)
+
+        # Not past synced_through: an alert updated mid-fetch may have moved
+        # ahead of pages already read
+        new_watermarks[full_name] = max(synced_through, since or "")
+
+    log_structured(
+        f"Incremental sync: {sum(1 for r in repos if watermarks.get(r['full_name']))} "
+        f"repos delta-fetched, {changed_count} alerts changed",
+        severity="INFO",
+    )
+
+    ordered = sorted(merged.items(), key=lambda kv: (repo_order[kv[0][0]], -(kv[0][1] or 0)))
+    critical_findings = [f for _, f in ordered if f["severity"] == "critical"]
+    high_findings = [f for _, f in ordered if f["severity"] == "high"]
+    return critical_findings, high_findings, new_watermarks
+
+
 def main(request):
     """Cloud Function entry point."""
     # Getting configuration from Environment Variables
     github_token = os.environ.get("CODEQL_GITHUB_TOKEN")
     bucket_name = os.environ.get("CODEQL_GCS_BUCKET_NAME")
+    local_dir = os.environ.get("CODEQL_STORAGE_DIR")
     topic = os.environ.get("CODEQL_GITHUB_TOPIC", "bcregistry")
+    sync_mode = os.environ.get("CODEQL_SYNC_MODE", "full").lower()
+    fetch_mode = os.environ.get("CODEQL_FETCH_MODE", "repo").lower()
+    org = os.environ.get("CODEQL_GITHUB_ORG", "bcgov")
 
     if not github_token:
         log_structured(
@@ -296,7 +838,18 @@ def main(request):
         )
         return "Internal Server Error: Missing Configuration", 500
 
-    log_structured(f"Starting CodeQL alert fetch for topic: {topic}", severity="INFO")
+    backend = get_storage_backend(bucket_name, local_dir)
+    if sync_mode == "incremental" and backend is None:
+        log_structured(
+            "Incremental sync needs a bucket or CODEQL_STORAGE_DIR; running a full sync",
+            severity="WARNING",
+        )
+        sync_mode = "full"
+
+    log_structured(
+        f"Starting CodeQL alert fetch for topic: {topic} ({sync_mode} sync)",
+        severity="INFO",
+    )
     check_and_log_rate_limit(github_token)
 
     repos = get_repos_by_topic(topic, github_token)
@@ -305,26 +858,48 @@ def main(request):
     critical_findings = []
     high_findings = []
 
-    for repo in repos:
-        full_name = repo["full_name"]
-        html_url = repo["html_url"]
-
-        # Throttling to avoid secondary rate limits
-        time.sleep(2)
+    watermarks, snapshot = {}, {}
+    if sync_mode == "incremental":
+        watermarks, snapshot = load_sync_state(backend)
+
+    # Taken before any alert is fetched, so changes made during the fetch are
+    # picked up again next run
+    synced_through = (datetime.now(timezone.utc) - WATERMARK_OVERLAP).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    # Org mode reads one org-wide stream instead of paginating every repo;
+    # otherwise repos are fetched concurrently, paced by the token buckets.
+    max_workers = max(1, int(os.environ.get("CODEQL_MAX_WORKERS", DEFAULT_MAX_WORKERS)))
+    repo_alerts = None
+    if fetch_mode == "org":
+        repo_alerts = fetch_org_alerts(org, repos, github_token, watermarks, max_workers)
+        if repo_alerts is None:
+            log_structured(
+                f"Org-wide alert endpoint unavailable for {org}; falling back to per-repo fetch",
+                severity="WARNING",
+            )
+    if repo_alerts is None:
+        repo_alerts = fetch_repo_alerts(repos, github_token, watermarks, max_workers)
 
-        alerts = get_all_open_alerts(full_name, github_token)
+    if sync_mode == "incremental":
+        critical_findings, high_findings, watermarks = sync_incremental(
+            repos, repo_alerts, watermarks, snapshot, synced_through
+        )
+    else:
+        for repo, alerts in zip(repos, repo_alerts):
+            full_name = repo["full_name"]
+            html_url = repo["html_url"]
 
-        if alerts:
-            for alert in alerts:
-                rule = alert.get("rule", {})
-                sec_severity = rule.get("security_severity_level")
+            if alerts:
+                for alert in alerts:
+                    rule = alert.get("rule", {})
+                    sec_severity = rule.get("security_severity_level")
 
-                details = get_alert_details(alert, full_name, html_url)
+                    details = get_alert_details(alert, full_name, html_url)
 
-                if sec_severity == "critical":
-                    critical_findings.append(details)
-                elif sec_severity == "high":
-                    high_findings.append(details)
+                    if sec_severity == "critical":
+                        critical_findings.append(details)
+                    elif sec_severity == "high":
+                        high_findings.append(details)
 
     log_structured(
         f"Processing complete. Critical: {len(critical_findings)}, High: {len(high_findings)}",
@@ -342,7 +917,7 @@ def main(request):
             },  # Limit payload size
         )
 
-    if not bucket_name:
+    if backend is None:
         log_structured("GCS_BUCKET_NAME not set, skipping upload", severity="WARNING")
         return json.dumps(
             {
@@ -353,23 +928,28 @@ def main(request):
             }
         ), 200
 
-    # Upload results only if there are findings
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    if critical_findings:
-        upload_to_gcs(
-            bucket_name, f"codeql_critical_{timestamp}.json", critical_findings
-        )
-        upload_to_gcs(bucket_name, "codeql_critical_latest.json", critical_findings)
-
-    if high_findings:
-        upload_to_gcs(bucket_name, f"codeql_high_{timestamp}.json", high_findings)
-        upload_to_gcs(bucket_name, "codeql_high_latest.json", high_findings)
+    # Upload timestamped results only if there are findings. In incremental
+    # mode the latest snapshots are the base for the next delta, so they are
+    # always rewritten (even when empty) before the watermarks are saved.
+    run_time = datetime.now()
+    timestamp = run_time.strftime("%Y-%m-%d_%H-%M-%S")
+    latest_ok = True
+    for severity, findings in (("critical", critical_findings), ("high", high_findings)):
+        if findings or sync_mode == "incremental":
+            latest_ok &= upload_snapshot(backend, severity, timestamp, findings)
+        write_findings_partition(backend, severity, run_time, findings)
+
+    # Only advance watermarks once the snapshots they describe are stored
+    if sync_mode == "incremental" and latest_ok:
+        save_sync_state(backend, watermarks)
 
     return json.dumps(
         {
             "status": "success",
             "critical_count": len(critical_findings),
             "high_count": len(high_findings),
-            "bucket": bucket_name,
+            "bucket": bucket_name or local_dir,
+            "sync_mode": sync_mode,
+            "fetch_mode": fetch_mode,
         }
     ), 200
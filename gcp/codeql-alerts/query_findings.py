@@ -0,0 +1,125 @@
+"""
+Query the CodeQL findings history written by the codeql-alerts function.
+
+Reads the Hive-partitioned Parquet files under findings/ (date=/severity=)
+from a local directory or a gs:// path. Date and severity filters prune
+whole partitions, repository/rule filters are pushed down to the Parquet
+reader, and only the columns needed for the answer are read. When a day
+has several runs, only each date/severity partition's latest run is
+counted. That run is picked from the file listing before any other
+filter, and runs with no findings count too, since every run writes a
+file (see findings_layout.py).
+
+Usage:
+    python query_findings.py --source gs://BUCKET/PREFIX --repo bcgov/lear --severity critical --days 90
+    python query_findings.py --source ./out --group-by repository --days 30
+    python query_findings.py --source ./out --group-by rule_id --severity high
+"""
+
+import argparse
+import posixpath
+from datetime import date, datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from findings_layout import FINDINGS_DIR, RUN_FILE_FORMAT
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("date", pa.string()), ("severity", pa.string())]), flavor="hive"
+)
+GROUP_COLUMNS = ("repository", "rule_id", "severity")
+
+
+def latest_runs(dataset):
+    """{(date, severity): run time} of the newest file in every partition.
+
+    Taken from file names alone, so it sees runs that found nothing and is
+    unaffected by repository/rule filters.
+    """
+    latest = {}
+    for path in dataset.files:
+        parts = dict(p.split("=", 1) for p in path.split("/") if "=" in p)
+        run = datetime.strptime(posixpath.basename(path).removesuffix(".parquet"), RUN_FILE_FORMAT)
+        key = (parts["date"], parts["severity"])
+        latest[key] = max(latest.get(key, run), run)
+    return latest
+
+
+def load_findings(source, days=None, severities=None, repos=None, rules=None, columns=()):
+    """Read matching findings rows from each date/severity partition's latest run."""
+    dataset = ds.dataset(
+        f"{source.rstrip('/')}/{FINDINGS_DIR}", format="parquet", partitioning=PARTITIONING
+    )
+
+    since = (date.today() - timedelta(days=days)).isoformat() if days else ""
+    runs = [
+        (ds.field("date") == day) & (ds.field("severity") == severity)
+        & (ds.field("snapshot_ts") == pa.scalar(run, pa.timestamp("s")))
+        for (day, severity), run in latest_runs(dataset).items()
+        if day >= since and (not severities or severity in severities)
+    ]
+    expr = ds.scalar(False)
+    for run in runs:
+        expr = expr | run
+    if repos:
+        expr = expr & ds.field("repository").isin(repos)
+    if rules:
+        expr = expr & ds.field("rule_id").isin(rules)
+
+    wanted = sorted({"date", "alert_number", *columns})
+    return dataset.to_table(columns=wanted, filter=expr)
+
+
+def count_by(table, group_by):
+    """Alert counts per (date, *group_by), sorted by date then key."""
+    keys = ["date", *group_by]
+    counts = table.group_by(keys).aggregate([("alert_number", "count")])
+    counts = counts.rename_columns(
+        [("alerts" if name == "alert_number_count" else name) for name in counts.column_names]
+    )
+    return counts.sort_by([(k, "ascending") for k in keys])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Query CodeQL findings history")
+    parser.add_argument("--source", required=True, help="Bucket path (gs://bucket/prefix) or local directory")
+    parser.add_argument("--days", type=int, default=90, help="Look back this many days (0 = all, default: 90)")
+    parser.add_argument("--severity", action="append", choices=["critical", "high"], help="Filter by severity (repeatable)")
+    parser.add_argument("--repo", action="append", help="Filter by repository full name (repeatable)")
+    parser.add_argument("--rule", action="append", help="Filter by rule_id (repeatable)")
+    parser.add_argument(
+        "--group-by",
+        action="append",
+        choices=GROUP_COLUMNS,
+        default=[],
+        help="Break counts down by column (repeatable)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    table = load_findings(
+        args.source,
+        days=args.days,
+        severities=args.severity,
+        repos=args.repo,
+        rules=args.rule,
+        columns=args.group_by,
+    )
+    if table.num_rows == 0:
+        print("No findings match.")
+        return
+
+    counts = count_by(table, args.group_by).to_pylist()
+    headers = ["date", *args.group_by, "alerts"]
+    widths = [max(len(h), *(len(str(row[h])) for row in counts)) for h in headers]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in counts:
+        print("  ".join(str(row[h]).ljust(w) for h, w in zip(headers, widths)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 """
 BC Registry SRE Scripts — Project Runner
 
-Runs all scanning and reporting scripts in sequence.
+Runs all scanning and reporting scripts as a dependency graph. Tasks that
+share no data run side by side (bounded by --jobs); tasks listed in
+DEPENDS_ON wait for the groups or scripts they consume, and still run (with
+a warning) if one of those failed, unless --strict-deps is given. Each
+task's output is captured and printed as one block when it finishes.
 Scripts that require arguments (e.g. --project) are configured here
 with their production defaults.
 
@@ -17,11 +21,28 @@ Usage:
 
     # Skip specific tasks
     uv run --project gcp/scripts gcp/scripts/__main__.py --skip inventory endpoints
+
+    # Limit how many scripts run at the same time (1 = sequential)
+    uv run --project gcp/scripts gcp/scripts/__main__.py --jobs 2
+
+    # Spawn a separate `uv run` per script instead of importing it (isolation)
+    uv run --project gcp/scripts gcp/scripts/__main__.py --mode subprocess
+
+    # Skip a task (e.g. the report) when any task it depends on failed
+    uv run --project gcp/scripts gcp/scripts/__main__.py --strict-deps
 """
 
 import argparse
+import contextvars
+import importlib
+import inspect
+import io
 import subprocess
 import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 
@@ -72,11 +93,46 @@ TASKS = [
     ("report", "generate_sre_report.py", [], "Generate monthly SRE health report"),
 ]
 
+# ── Task dependencies ─────────────────────────────────────────────────────────
+# Task (group or script) -> groups or scripts that must finish first.
+# Anything not listed here starts as soon as a worker is free.
+DEPENDS_ON = {
+    "report": ["inventory", "audit", "endpoints", "silver"],
+}
+
 GROUPS = sorted({t[0] for t in TASKS})
+DEFAULT_JOBS = 4
+MODES = ["in-process", "subprocess"]
+
+
+def resolve_dependencies(tasks: list[tuple]) -> dict[str, set[str]]:
+    """Map each task's script to the scripts it waits on, limited to `tasks`.
+
+    Dependencies on filtered-out tasks are dropped, so `--only report` runs
+    the report against whatever output is already on disk.
+    """
+    deps: dict[str, set[str]] = {}
+    for group, script, _, _ in tasks:
+        wanted = DEPENDS_ON.get(group, []) + DEPENDS_ON.get(script, [])
+        deps[script] = {
+            s for g, s, _, _ in tasks if s != script and (g in wanted or s in wanted)
+        }
+
+    # Reject cycles up front instead of deadlocking the scheduler
+    done: set[str] = set()
+    remaining = dict(deps)
+    while remaining:
+        ready = [s for s, d in remaining.items() if d <= done]
+        if not ready:
+            raise ValueError(f"Dependency cycle between: {sorted(remaining)}")
+        for s in ready:
+            done.add(s)
+            del remaining[s]
+    return deps
 
 
-def run_script(script_path: Path, extra_argv: list[str]) -> tuple[bool, float]:
-    """Run a script as a subprocess, streaming its output. Returns (success, elapsed_s)."""
+def run_script(script_path: Path, extra_argv: list[str]) -> tuple[bool, float, str]:
+    """Run a script as a subprocess, capturing its output. Returns (success, elapsed_s, output)."""
     cmd = [
         sys.executable,
         "-m",
@@ -89,13 +145,188 @@ def run_script(script_path: Path, extra_argv: list[str]) -> tuple[bool, float]:
 
     t0 = time.monotonic()
     try:
-        result = subprocess.run(cmd, cwd=str(SCRIPTS_DIR.parent.parent))
+        result = subprocess.run(
+            cmd,
+            cwd=str(SCRIPTS_DIR.parent.parent),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
         elapsed = time.monotonic() - t0
-        return result.returncode == 0, elapsed
+        return result.returncode == 0, elapsed, result.stdout
     except Exception as e:
         elapsed = time.monotonic() - t0
-        print(f"  ⚠️  Exception: {e}")
-        return False, elapsed
+        return False, elapsed, f"⚠️  Exception: {e}"
+
+
+# Buffer of the in-process task the current code runs for, if any
+_task_output: contextvars.ContextVar[io.StringIO | None] = contextvars.ContextVar("task_output", default=None)
+
+
+class TaskOutput(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr that routes writes per task.
+
+    Code running under capture() (in the task's thread, or in a pool worker
+    it submitted to, see propagate_context) writes into that task's buffer;
+    everything else (including the scheduler) writes to the real stream.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    @staticmethod
+    def capture(buffer: io.StringIO) -> contextvars.Token:
+        """Route this context's writes to `buffer`; pass the token to release()."""
+        return _task_output.set(buffer)
+
+    @staticmethod
+    def release(token: contextvars.Token):
+        _task_output.reset(token)
+
+    def _target(self):
+        return _task_output.get() or self._stream
+
+    def write(self, s: str) -> int:
+        return self._target().write(s)
+
+    def flush(self):
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+def propagate_context():
+    """Run every ThreadPoolExecutor call in the context of the code that submitted it.
+
+    Worker threads don't inherit context variables, so without this a
+    scanner's own pools (repo/file fetches, GitHub client pools) would print
+    straight to the terminal, interleaved with other tasks.
+    """
+    submit = ThreadPoolExecutor.submit
+    if getattr(submit, "propagates_context", False):
+        return
+
+    def submit_in_context(self, fn, /, *args, **kwargs):
+        return submit(self, contextvars.copy_context().run, fn, *args, **kwargs)
+
+    submit_in_context.propagates_context = True
+    ThreadPoolExecutor.submit = submit_in_context
+
+
+_modules: dict[str, object] = {}
+_modules_lock = threading.Lock()
+
+
+def load_module(script_path: Path):
+    """Import a script as a module once per run and return it."""
+    with _modules_lock:
+        if script_path.stem not in _modules:
+            if str(SCRIPTS_DIR) not in sys.path:
+                sys.path.insert(0, str(SCRIPTS_DIR))
+            _modules[script_path.stem] = importlib.import_module(script_path.stem)
+        return _modules[script_path.stem]
+
+
+def run_in_process(script_path: Path, extra_argv: list[str]) -> tuple[bool, float, str]:
+    """Import a script and call its main() in this interpreter. Returns (success, elapsed_s, output).
+
+    Skips the `uv` resolve and interpreter start-up, and lets scripts share
+    the clients cached in gcp_clients. Output is captured through TaskOutput,
+    which must already be installed as sys.stdout/sys.stderr, together with
+    propagate_context().
+    """
+    buffer = io.StringIO()
+    token = TaskOutput.capture(buffer)
+    t0 = time.monotonic()
+    try:
+        module = load_module(script_path)
+        entry = getattr(module, "main", None)
+        if entry is None:
+            raise AttributeError(f"{script_path.name} has no main() to call in-process")
+        if inspect.signature(entry).parameters:
+            entry(extra_argv)
+        else:
+            entry()
+        success = True
+    except SystemExit as e:
+        success = e.code in (0, None)
+    except Exception:
+        traceback.print_exc()
+        success = False
+    finally:
+        TaskOutput.release(token)
+    return success, time.monotonic() - t0, buffer.getvalue()
+
+
+def print_task_block(task: tuple, success: bool, elapsed: float, output: str):
+    """Print a finished task's captured output as a single uninterrupted block."""
+    group, script, argv, desc = task
+    print(f"\n  ▶  [{group}] {desc}")
+    print(f"     {script}" + (f"  {' '.join(argv)}" if argv else ""))
+    # Progress lines use \r to redraw in place; keep only the final state
+    for line in output.rstrip().split("\n"):
+        line = line.rsplit("\r", 1)[-1]
+        print(f"     │ {line}")
+    status = "✅" if success else "❌"
+    print(f"     {status}  {'done' if success else 'FAILED'}  ({elapsed:.1f}s)")
+
+
+def run_tasks(
+    tasks: list[tuple], jobs: int, mode: str = "in-process", strict_deps: bool = False
+) -> dict[str, tuple[bool, float, str]]:
+    """Run tasks in dependency order with up to `jobs` at a time.
+
+    Returns {script: (success, elapsed_s, note)}. A task whose dependency
+    failed still runs, against whatever output is on disk, with a warning;
+    with `strict_deps` it is not started and is reported as failed.
+    """
+    runner = run_in_process if mode == "in-process" else run_script
+    deps = resolve_dependencies(tasks)
+    results: dict[str, tuple[bool, float, str]] = {}
+    pending = list(tasks)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for task in list(pending):
+                if len(running) >= jobs:
+                    break
+                script = task[1]
+                if any(d not in results for d in deps[script]):
+                    continue
+                pending.remove(task)
+
+                failed_deps = sorted(d for d in deps[script] if not results[d][0])
+                if failed_deps and strict_deps:
+                    results[script] = (False, 0.0, f"skipped: {', '.join(failed_deps)} failed")
+                    print(f"\n  ⏭  {script} skipped — dependency failed: {', '.join(failed_deps)}")
+                    continue
+                if failed_deps:
+                    print(f"\n  ⚠️  {script} running anyway — dependency failed: {', '.join(failed_deps)}")
+
+                script_path = SCRIPTS_DIR / script
+                if not script_path.exists():
+                    print(f"\n  ⚠️  {script} not found, skipping.")
+                    results[script] = (False, 0.0, "not found")
+                    continue
+
+                print(f"  …  started {script}")
+                running[pool.submit(runner, script_path, task[2])] = task
+
+            if not running:
+                # Everything left is blocked on a skipped task; loop to skip it too
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                success, elapsed, output = future.result()
+                print_task_block(task, success, elapsed, output)
+                results[task[1]] = (success, elapsed, "")
+
+    return results
 
 
 def print_banner(text: str, width: int = 60):
@@ -120,9 +351,31 @@ def main():
         metavar="GROUP",
         help="Skip scripts from these groups",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar="N",
+        help=f"Maximum number of scripts to run at once (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=MODES,
+        default="in-process",
+        help="Import scripts and call main() in this process (default), "
+        "or spawn `uv run` per script for full isolation",
+    )
+    parser.add_argument(
+        "--strict-deps",
+        action="store_true",
+        help="Skip a task when any task it depends on failed (default: run it with a warning)",
+    )
     parser.add_argument("--list", action="store_true", help="List all tasks and exit")
     args = parser.parse_args()
 
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     if args.list:
         print(f"\n{'─' * 60}")
         print(f"  {'GROUP':<12} {'SCRIPT':<38} DESCRIPTION")
@@ -130,7 +383,10 @@ def main():
         for group, script, argv, desc in TASKS:
             extra = f"  [{' '.join(argv)}]" if argv else ""
             print(f"  {group:<12} {script:<38} {desc}{extra}")
-        print(f"{'─' * 60}\n")
+        print(f"{'─' * 60}")
+        for task, needs in DEPENDS_ON.items():
+            print(f"  {task} waits for: {', '.join(needs)}")
+        print()
         return
 
     # Filter tasks
@@ -149,29 +405,26 @@ def main():
     start_time = datetime.now()
     print_banner(f"BC Registry SRE Scripts  —  {start_time.strftime('%Y-%m-%d %H:%M')}")
     print(f"  Tasks to run : {len(active_tasks)}")
+    print(f"  Parallel jobs: {args.jobs}")
+    print(f"  Mode         : {args.mode}")
     print(f"  Output dir   : {OUTPUT_DIR}")
+    print()
 
-    results = []
-    current_group = None
-
-    for group, script, argv, desc in active_tasks:
-        if group != current_group:
-            current_group = group
-            print(f"\n  ── {group.upper()} ──")
+    if args.mode == "in-process":
+        sys.stdout = TaskOutput(sys.stdout)
+        sys.stderr = TaskOutput(sys.stderr)
+        propagate_context()
 
-        script_path = SCRIPTS_DIR / script
-        if not script_path.exists():
-            print(f"  ⚠️  {script} not found, skipping.")
-            results.append((script, desc, False, 0.0, "not found"))
-            continue
-
-        print(f"\n  ▶  {desc}")
-        print(f"     {script}" + (f"  {' '.join(argv)}" if argv else ""))
+    try:
+        outcome = run_tasks(active_tasks, args.jobs, args.mode, args.strict_deps)
+    except ValueError as e:
+        print(f"  ❌ {e}")
+        sys.exit(1)
 
-        success, elapsed = run_script(script_path, argv)
-        status = "✅" if success else "❌"
-        results.append((script, desc, success, elapsed, ""))
-        print(f"     {status}  {'done' if success else 'FAILED'}  ({elapsed:.1f}s)")
+    results = [
+        (script, desc, *outcome[script])
+        for _, script, _, desc in active_tasks
+    ]
 
     # ── Summary ───────────────────────────────────────────────────────────────
     total_elapsed = (datetime.now() - start_time).total_seconds()
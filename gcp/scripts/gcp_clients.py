@@ -0,0 +1,83 @@
+"""
+Shared Google Cloud credentials and API clients for the SRE scripts.
+
+Each factory is memoised per process, so when __main__.py runs several
+scanners in-process they reuse one set of credentials and one gRPC channel
+per client type instead of building their own. Scripts run on their own
+(`uv run <script>.py`) behave exactly as before: they create each client
+once on first use.
+
+Google SDK imports are deferred to the factory that needs them, so a script
+only needs the packages for the clients it actually asks for.
+"""
+
+import functools
+import threading
+
+
+def _shared(factory):
+    """Memoise a zero/positional-arg factory; safe to call from several threads."""
+    cache = {}
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def wrapper(*args):
+        with lock:
+            if args not in cache:
+                cache[args] = factory(*args)
+            return cache[args]
+
+    return wrapper
+
+
+@_shared
+def default_credentials(scopes: tuple[str, ...] | None = None):
+    """Return (credentials, project_id) from google.auth.default()."""
+    import google.auth
+
+    return google.auth.default(scopes=list(scopes) if scopes else None)
+
+
+@_shared
+def run_services_client():
+    """Cloud Run Admin API v2 services client."""
+    from google.cloud import run_v2
+
+    credentials, _ = default_credentials()
+    return run_v2.ServicesClient(credentials=credentials)
+
+
+@_shared
+def run_jobs_client():
+    """Cloud Run Admin API v2 jobs client."""
+    from google.cloud import run_v2
+
+    credentials, _ = default_credentials()
+    return run_v2.JobsClient(credentials=credentials)
+
+
+@_shared
+def run_revisions_client():
+    """Cloud Run Admin API v2 revisions client."""
+    from google.cloud import run_v2
+
+    credentials, _ = default_credentials()
+    return run_v2.RevisionsClient(credentials=credentials)
+
+
+@_shared
+def secret_manager_client():
+    """Secret Manager client, for resolving secret-backed env vars."""
+    from google.cloud import secretmanager
+
+    credentials, _ = default_credentials()
+    return secretmanager.SecretManagerServiceClient(credentials=credentials)
+
+
+@_shared
+def uptime_check_client():
+    """Cloud Monitoring uptime check client."""
+    from google.cloud import monitoring_v3
+
+    credentials, _ = default_credentials()
+    return monitoring_v3.UptimeCheckServiceClient(credentials=credentials)
@@ -22,10 +22,11 @@ import numpy as np
 import jinja2
 from datetime import datetime
 from dateutil import parser
-import google.auth
 from google.cloud import monitoring_v3
 from google.cloud import logging_v2
 
+import gcp_clients
+
 def sparkline(values):
     """Generate a sparkline string for a list of values."""
     if not values:
@@ -194,7 +195,7 @@ def generate_report(project_id, service_name, start_date, end_date, template_pat
     start_time = parser.parse(start_date)
     end_time = parser.parse(end_date)
     
-    credentials, _ = google.auth.default()
+    credentials, _ = gcp_clients.default_credentials()
     monitoring_client = monitoring_v3.MetricServiceClient(credentials=credentials)
     service_monitor_client = monitoring_v3.ServiceMonitoringServiceClient(credentials=credentials)
     logging_client = logging_v2.Client(credentials=credentials, project=project_id)
@@ -230,7 +231,7 @@ def generate_report(project_id, service_name, start_date, end_date, template_pat
     )
     return md
 
-if __name__ == "__main__":
+def main(argv=None):
     parser_args = argparse.ArgumentParser(description="Generate SRE Report for a Service")
     parser_args.add_argument("--project", required=True, help="GCP Project ID")
     parser_args.add_argument("--service-name", required=True, help="Cloud Run Service Name")
@@ -238,7 +239,7 @@ if __name__ == "__main__":
     parser_args.add_argument("--template", help="Optional path to a Jinja2 template file. Uses default if not provided.")
     parser_args.add_argument("--output", help="Output MD file name")
     
-    args = parser_args.parse_args()
+    args = parser_args.parse_args(argv)
     
     if args.month:
         try:
@@ -272,3 +273,7 @@ if __name__ == "__main__":
     with open(args.output, 'w') as f:
         f.write(report_md)
     print(f"Report successfully saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""Shared GitHub API helpers for the gcp/scripts scanners."""
+
+from github_client.blob_cache import BlobCache
+from github_client.client import GitHubClient
+from github_client.conditional import ConditionalCache
+from github_client.throttle import AdaptiveLimiter, MaxRetriesExceededError
+from state import StateStore  # re-exported; lives outside the package for non-GitHub scanners
+
+__all__ = [
+    "AdaptiveLimiter",
+    "BlobCache",
+    "ConditionalCache",
+    "GitHubClient",
+    "MaxRetriesExceededError",
+    "StateStore",
+]
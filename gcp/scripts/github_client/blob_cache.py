@@ -0,0 +1,59 @@
+"""
+Content-addressed on-disk cache of GitHub blob contents.
+
+Git blob SHAs identify file contents exactly, so a blob fetched once never
+needs fetching again: a dependency file that hasn't changed keeps the same
+SHA in every tree listing. Entries are stored as decoded UTF-8 text under
+output/.cache/blobs/<sha[:2]>/<sha[2:]> and shared by every scanner.
+"""
+
+import re
+import threading
+from pathlib import Path
+
+from state import CACHE_ROOT, write_atomic
+
+CACHE_DIR = CACHE_ROOT / "blobs"
+
+_SHA_RE = re.compile(r"^[0-9a-f]{40}$|^[0-9a-f]{64}$")
+
+
+class BlobCache:
+    """Thread-safe map of blob SHA -> file text, persisted across runs."""
+
+    def __init__(self, root: Path = CACHE_DIR):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, sha: str) -> Path | None:
+        sha = sha.lower()
+        if not _SHA_RE.match(sha):
+            return None
+        return self.root / sha[:2] / sha[2:]
+
+    def get(self, sha: str | None) -> str | None:
+        """Return cached text for `sha`, or None if it hasn't been stored."""
+        path = self._path(sha) if sha else None
+        text = None
+        if path is not None:
+            try:
+                text = path.read_text(encoding="utf-8")
+            except OSError:
+                text = None
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    def put(self, sha: str | None, text: str):
+        """Store `text` under `sha`. Writes are atomic, so concurrent runs are safe."""
+        path = self._path(sha) if sha else None
+        if path is not None:
+            write_atomic(path, text)
+
+    def summary(self) -> str:
+        return f"{self.hits} cached, {self.misses} fetched"
@@ -0,0 +1,167 @@
+"""
+Pooled, rate-limit-aware GitHub REST client shared by the scanners.
+
+One `GitHubClient` owns a `requests.Session`, so every call reuses pooled
+keep-alive TLS connections, and routes each request through an
+`AdaptiveLimiter` for the retry/backoff rules ported from
+`make_github_request`. Connection errors and 502/503/504 on GET are retried
+by the session's adapter. On top of that it provides the helpers each script
+used to duplicate:
+
+    gh = GitHubClient(token)
+    repos = gh.paginate("https://api.github.com/user/repos?per_page=100")
+    tree_sha, tree = gh.get_repo_tree("bcgov", "lear")
+    text = gh.get_file_content("bcgov", "lear", "legal-api/requirements.txt", tree[...])
+
+Listings and trees are revalidated with ETags (`ConditionalCache`) and file
+contents are served from the blob-SHA cache (`BlobCache`). Every component
+can be swapped or disabled through the constructor, e.g. `http_cache=None`
+to always fetch fresh pages.
+"""
+
+import base64
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from github_client import graphql
+from github_client.blob_cache import BlobCache
+from github_client.conditional import ConditionalCache
+from github_client.throttle import DEFAULT_MAX_CONCURRENCY, AdaptiveLimiter
+
+API_URL = "https://api.github.com"
+
+# Transport-level retries for idempotent requests; rate limits are the limiter's job
+TRANSPORT_RETRIES = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=(502, 503, 504),
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+
+_DEFAULT = object()
+
+
+def build_session(pool_size: int = DEFAULT_MAX_CONCURRENCY * 2) -> requests.Session:
+    """Session with a connection pool big enough for `pool_size` concurrent requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=pool_size, max_retries=TRANSPORT_RETRIES
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class GitHubClient:
+    """Thread-safe GitHub API client: pooled session, throttling, pagination, caching."""
+
+    def __init__(
+        self,
+        token: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        session: requests.Session | None = None,
+        limiter: AdaptiveLimiter | None = None,
+        http_cache: ConditionalCache | None = _DEFAULT,
+        blob_cache: BlobCache | None = _DEFAULT,
+    ):
+        self.headers = {
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json",
+        }
+        self.limiter = limiter or AdaptiveLimiter(max_concurrency)
+        self.session = session or build_session(self.limiter.max_concurrency * 2)
+        self.http_cache = ConditionalCache() if http_cache is _DEFAULT else http_cache
+        self.blob_cache = BlobCache() if blob_cache is _DEFAULT else blob_cache
+
+    # ── Raw requests ──────────────────────────────────────────────────
+
+    def request(self, method: str, url: str, headers: dict | None = None, **kwargs) -> requests.Response:
+        """Send a throttled request. `url` may be absolute or an API path."""
+        if url.startswith("/"):
+            url = API_URL + url
+        kwargs.setdefault("timeout", 30)
+        return self.limiter.request(
+            method, url, session=self.session, headers={**self.headers, **(headers or {})}, **kwargs
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_cached(self, url: str) -> requests.Response:
+        """GET `url`, revalidating a stored copy with ETag/Last-Modified when caching is on."""
+        if url.startswith("/"):
+            url = API_URL + url
+        if self.http_cache is None:
+            return self.get(url)
+        return self.http_cache.get(url, self.headers, fetch=self.get)
+
+    # ── Pagination ────────────────────────────────────────────────────
+
+    def iter_pages(self, url: str):
+        """Yield the decoded JSON of each page, following `Link: rel="next"`.
+
+        Raises requests.HTTPError on a non-2xx page. Stop iterating early to
+        avoid fetching the remaining pages.
+        """
+        while url:
+            resp = self.get_cached(url)
+            resp.raise_for_status()
+            yield resp.json()
+            url = resp.links.get("next", {}).get("url")
+
+    def paginate(self, url: str) -> list:
+        """Fetch all pages from a paginated list endpoint."""
+        results = []
+        for page in self.iter_pages(url):
+            results.extend(page)
+        return results
+
+    # ── Repository contents ───────────────────────────────────────────
+
+    def get_repo_tree(self, owner: str, repo: str, ref: str = "HEAD") -> tuple[str | None, dict[str, str]]:
+        """Return (tree_sha, {path: blob_sha}) for every file in the repo at `ref`."""
+        resp = self.get_cached(f"/repos/{owner}/{repo}/git/trees/{ref}?recursive=1")
+        if resp.status_code != 200:
+            return None, {}
+        data = resp.json()
+        return data.get("sha"), {
+            item["path"]: item["sha"]
+            for item in data.get("tree", [])
+            if item["type"] == "blob"
+        }
+
+    def get_file_content(self, owner: str, repo: str, path: str, sha: str | None = None) -> str | None:
+        """Fetch and decode a file, using the blob cache when `sha` is known."""
+        if self.blob_cache is not None:
+            cached = self.blob_cache.get(sha)
+            if cached is not None:
+                return cached
+        resp = self.get(f"/repos/{owner}/{repo}/contents/{path}")
+        if resp.status_code != 200:
+            return None
+        data = resp.json()
+        if data.get("encoding") != "base64":
+            return None
+        text = base64.b64decode(data["content"]).decode("utf-8", errors="replace")
+        if self.blob_cache is not None:
+            self.blob_cache.put(data.get("sha") or sha, text)
+        return text
+
+    def fetch_files(self, files: list[tuple[str, str, str, str]]) -> dict[tuple[str, str, str], str | None]:
+        """Resolve many (owner, repo, path, blob_sha) entries via cache, batched GraphQL, then REST.
+
+        See `github_client.graphql.fetch_files`.
+        """
+        return graphql.fetch_files(
+            files,
+            self.headers,
+            self.blob_cache,
+            post=self.post,
+            fallback=self.get_file_content,
+        )
@@ -0,0 +1,104 @@
+"""
+ETag / Last-Modified conditional-request layer for GitHub GET calls.
+
+GitHub returns `ETag` (and often `Last-Modified`) on list endpoints such as
+/user/repos and /repos/{o}/{r}/collaborators. Replaying those validators as
+`If-None-Match` / `If-Modified-Since` makes GitHub answer `304 Not Modified`
+for unchanged pages, and 304s do not count against the primary rate limit.
+
+Each page is stored under output/.cache/http, keyed by URL plus the auth and
+Accept headers (GitHub varies responses on both). A 304 is turned back into
+an ordinary 200 `requests.Response` built from the stored body and Link
+header, so callers' pagination code does not change.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from state import CACHE_ROOT, write_atomic
+
+CACHE_DIR = CACHE_ROOT / "http"
+
+# Response headers worth keeping alongside the cached body
+_STORED_HEADERS = ("Content-Type", "Link", "ETag", "Last-Modified")
+
+
+class ConditionalCache:
+    """Persisted validators + bodies for conditional GitHub requests."""
+
+    def __init__(self, root: Path = CACHE_DIR):
+        self.root = Path(root)
+        self.not_modified = 0
+        self.fetched = 0
+        self._lock = threading.Lock()
+
+    def _path(self, url: str, headers: dict) -> Path:
+        vary = "\n".join(
+            [url, headers.get("Authorization", ""), headers.get("Accept", "")]
+        )
+        digest = hashlib.sha256(vary.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest[2:]}.json"
+
+    def _load(self, path: Path) -> dict | None:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def get(self, url: str, headers: dict, fetch=requests.get) -> requests.Response:
+        """GET `url` conditionally via `fetch(url, headers=...)`.
+
+        Returns the live response, or a replayed 200 from the cache when
+        GitHub answers 304. Non-200 responses are returned untouched and
+        never cached.
+        """
+        path = self._path(url, headers)
+        entry = self._load(path)
+
+        request_headers = dict(headers)
+        if entry:
+            if entry["headers"].get("ETag"):
+                request_headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                request_headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        resp = fetch(url, headers=request_headers)
+
+        if resp.status_code == 304 and entry:
+            with self._lock:
+                self.not_modified += 1
+            return self._replay(entry, resp)
+
+        with self._lock:
+            self.fetched += 1
+        if resp.status_code == 200 and (
+            resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+        ):
+            stored = {h: resp.headers[h] for h in _STORED_HEADERS if h in resp.headers}
+            write_atomic(
+                path,
+                json.dumps({"url": url, "headers": stored, "body": resp.text}),
+            )
+        return resp
+
+    @staticmethod
+    def _replay(entry: dict, not_modified: requests.Response) -> requests.Response:
+        """Build a 200 response from a cache entry plus the 304's fresh headers."""
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = entry["url"]
+        resp.encoding = "utf-8"
+        resp._content = entry["body"].encode("utf-8")
+        merged = CaseInsensitiveDict(not_modified.headers)
+        merged.update(entry["headers"])
+        resp.headers = merged
+        resp.request = not_modified.request
+        return resp
+
+    def summary(self) -> str:
+        return f"{self.not_modified} not modified (304), {self.fetched} fetched"
@@ -0,0 +1,153 @@
+"""
+Batch fetch of file contents across many repos through GitHub's GraphQL API.
+
+Over REST, every dependency manifest costs its own /contents call. Here many
+(owner, repo, path) targets are folded into one aliased query:
+
+    query {
+      r0: repository(owner: "bcgov", name: "lear") {
+        f0: object(expression: "HEAD:legal-api/requirements.txt") { ...blob }
+        f1: object(expression: "HEAD:legal-api/Dockerfile") { ...blob }
+      }
+      r1: repository(owner: "bcgov", name: "namex") { ... }
+      rateLimit { cost remaining }
+    }
+
+Each `object` lookup is a single node (no connections), so a query's cost
+stays at 1 point; batches are capped by blob count instead so responses stay
+small and well inside GitHub's 10 s query timeout. A batch that fails with a
+timeout/5xx is split in half and retried.
+"""
+
+import json
+
+import requests
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Blobs per query. Manifests are small, but large batches risk the 10 s timeout.
+DEFAULT_BATCH_SIZE = 50
+
+_BLOB_FIELDS = "... on Blob { oid text isBinary isTruncated }"
+
+
+def build_query(batch: list[tuple[str, str, str]]) -> tuple[str, dict[tuple[str, str], tuple]]:
+    """Build an aliased query for `batch`. Returns (query, {(repo_alias, file_alias): target})."""
+    by_repo: dict[tuple[str, str], list[tuple[str, str, str]]] = {}
+    for target in batch:
+        by_repo.setdefault(target[:2], []).append(target)
+
+    aliases = {}
+    parts = []
+    for r, ((owner, name), targets) in enumerate(by_repo.items()):
+        fields = []
+        for f, target in enumerate(targets):
+            # json.dumps yields a valid GraphQL string literal
+            expression = json.dumps(f"HEAD:{target[2]}")
+            fields.append(f"f{f}: object(expression: {expression}) {{ {_BLOB_FIELDS} }}")
+            aliases[(f"r{r}", f"f{f}")] = target
+        parts.append(
+            f"r{r}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+            f"{{ {' '.join(fields)} }}"
+        )
+    parts.append("rateLimit { cost remaining }")
+    return "query { " + " ".join(parts) + " }", aliases
+
+
+def fetch_blob_texts(
+    targets: list[tuple[str, str, str]],
+    headers: dict,
+    post=requests.post,
+    cache=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[tuple[str, str, str], str | None]:
+    """Fetch the HEAD text of every (owner, repo, path) in `targets`.
+
+    Returns {target: text}. A value of None means GitHub answered and the
+    file is missing or binary; a target absent from the result could not be
+    answered over GraphQL (failed batch, rate limit, truncated blob) and
+    should be fetched over REST. Fetched blobs are stored in `cache` (a BlobCache)
+    under their oid when one is given.
+    """
+    results: dict[tuple[str, str, str], str | None] = {}
+    pending = [targets[i : i + batch_size] for i in range(0, len(targets), batch_size)]
+    while pending:
+        batch = pending.pop()
+        query, aliases = build_query(batch)
+        try:
+            resp = post(GRAPHQL_URL, headers=headers, json={"query": query}, timeout=30)
+        except requests.RequestException:
+            resp = None
+
+        if resp is None or resp.status_code in (502, 503, 504):
+            if len(batch) > 1:
+                mid = len(batch) // 2
+                pending += [batch[:mid], batch[mid:]]
+            continue
+        if resp.status_code != 200:
+            continue
+
+        # Partial data is normal: a missing repo yields a NOT_FOUND error plus
+        # a null node. Any other error (RATE_LIMITED, a timeout, ...) leaves
+        # the nodes it touched unanswered, and one without a path leaves the
+        # whole batch unanswered, even if its data came back null.
+        body = resp.json()
+        errors = [e for e in body.get("errors") or [] if e.get("type") != "NOT_FOUND"]
+        if any(not e.get("path") for e in errors):
+            continue
+        failed = {e["path"][0] for e in errors}
+        data = body.get("data") or {}
+        for (repo_alias, file_alias), target in aliases.items():
+            if repo_alias in failed or repo_alias not in data:
+                continue
+            repo = data[repo_alias]
+            if repo is not None and file_alias not in repo:
+                continue
+            node = repo and repo[file_alias]
+            if node is None or node.get("isBinary"):
+                results[target] = None
+            elif node.get("isTruncated") or node.get("text") is None:
+                continue
+            else:
+                results[target] = node["text"]
+                if cache is not None:
+                    cache.put(node.get("oid"), node["text"])
+    return results
+
+
+def fetch_files(
+    files: list[tuple[str, str, str, str]],
+    headers: dict,
+    cache,
+    post=requests.post,
+    fallback=None,
+) -> dict[tuple[str, str, str], str | None]:
+    """Resolve (owner, repo, path, blob_sha) entries to text as cheaply as possible.
+
+    Blob-cache hits cost nothing (pass cache=None to skip the cache), the
+    rest go out in batched GraphQL queries,
+    and anything GraphQL can't answer is passed to
+    `fallback(owner, repo, path, sha)` (typically a REST contents call).
+    Returns {(owner, repo, path): text or None}.
+    """
+    contents: dict[tuple[str, str, str], str | None] = {}
+    missing = []
+    for owner, repo, path, sha in files:
+        text = cache.get(sha) if cache is not None else None
+        if text is None:
+            missing.append((owner, repo, path))
+        else:
+            contents[(owner, repo, path)] = text
+
+    if missing:
+        print(f"  Fetching {len(missing)} uncached file(s) via GraphQL...")
+        contents.update(fetch_blob_texts(missing, headers, post=post, cache=cache))
+
+    if fallback is not None:
+        shas = {(o, r, p): s for o, r, p, s in files}
+        leftovers = [t for t in missing if t not in contents]
+        if leftovers:
+            print(f"  Falling back to REST for {len(leftovers)} file(s)...")
+        for target in leftovers:
+            contents[target] = fallback(*target, shas[target])
+    return contents
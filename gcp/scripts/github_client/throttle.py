@@ -0,0 +1,138 @@
+"""
+Adaptive concurrency limiter for GitHub REST calls.
+
+Bounds how many requests are in flight at once and tunes that bound from the
+`x-ratelimit-*` headers on every response: it grows by one slot while quota is
+plentiful, shrinks in proportion as `x-ratelimit-remaining` approaches zero,
+and halves (pausing every caller) when GitHub answers with a primary or
+secondary rate-limit response. Rate-limit detection and backoff mirror
+`make_github_request` in gcp/codeql-alerts/main.py: honour `Retry-After`,
+wait for `x-ratelimit-reset` when quota is exhausted, fall back to
+exponential backoff for secondary limits, and treat a 403 that still has
+quota as a genuine permission error.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+# Below this much remaining quota, concurrency is scaled down proportionally
+LOW_WATER_REMAINING = 500
+
+# GitHub asks integrators to keep well under 100 concurrent requests
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Base wait for a rate limit without Retry-After/reset headers (doubles per retry)
+BACKOFF_SECONDS = 60
+
+
+class MaxRetriesExceededError(Exception):
+    """Raised when a request is still rate limited after every retry."""
+
+
+class AdaptiveLimiter:
+    """Thread-safe gate that keeps GitHub requests under the rate limits."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+        max_retries: int = 5,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_retries = max_retries
+        self._limit = self.max_concurrency
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return self._limit
+
+    @contextmanager
+    def slot(self):
+        """Block until a request may be sent, then hold a slot for its duration."""
+        with self._cond:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause <= 0 and self._in_flight < self._limit:
+                    break
+                self._cond.wait(timeout=pause if pause > 0 else None)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def observe(self, response: requests.Response, attempt: int = 0) -> float:
+        """Adjust the limit from a response. Returns seconds to wait before retrying (0 = no retry)."""
+        headers = response.headers
+        remaining = headers.get("x-ratelimit-remaining")
+        reset_time = headers.get("x-ratelimit-reset")
+        retry_after = headers.get("Retry-After")
+        wait_time = 0.0
+
+        # A 403 with quota left and no Retry-After is a genuine permission error
+        genuine_403 = (
+            response.status_code == 403
+            and not retry_after
+            and remaining is not None
+            and remaining.isdigit()
+            and int(remaining) > 0
+        )
+        if response.status_code in (403, 429) and not genuine_403:
+            body = response.text.lower()
+            if retry_after:
+                wait_time = float(retry_after)
+            elif remaining == "0" and reset_time:
+                wait_time = max(int(reset_time) - time.time(), 1)
+            elif response.status_code == 429 or (
+                "secondary rate limit" in body
+                or "abuse detection" in body
+                or "rate limit exceeded" in body
+            ):
+                wait_time = float(BACKOFF_SECONDS * 2**attempt)
+
+        with self._cond:
+            if wait_time:
+                # Back off hard: halve concurrency and hold every caller
+                self._limit = max(self.min_concurrency, self._limit // 2)
+                self._paused_until = max(self._paused_until, time.monotonic() + wait_time)
+            elif remaining is not None and remaining.isdigit():
+                left = int(remaining)
+                if left < LOW_WATER_REMAINING:
+                    scaled = self.max_concurrency * left // LOW_WATER_REMAINING
+                    self._limit = max(self.min_concurrency, scaled)
+                elif self._limit < self.max_concurrency:
+                    self._limit += 1
+            self._cond.notify_all()
+        return wait_time
+
+    def request(self, method: str, url: str, session=None, **kwargs) -> requests.Response:
+        """Send a request inside a slot, retrying rate-limited responses.
+
+        Uses `session` (e.g. a pooled requests.Session) when given. Non-rate-
+        limit errors (404, genuine 403, 5xx) are returned unchanged for the
+        caller to handle; MaxRetriesExceededError is raised if the request
+        is still rate limited after `max_retries` attempts.
+        """
+        sender = session if session is not None else requests
+        for attempt in range(self.max_retries):
+            with self.slot():
+                response = sender.request(method, url, **kwargs)
+            if not self.observe(response, attempt):
+                return response
+        raise MaxRetriesExceededError(f"Max retries exceeded for URL: {url}")
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
@@ -0,0 +1,210 @@
+"""
+Declarative ignore rules for env var findings, compiled into one matcher.
+
+Rules live in a TOML file, one [[rule]] table each. A rule suppresses a
+finding when every scope it sets matches; scopes it leaves out match
+anything:
+
+    [[rule]]
+    id = "pay-connector"                       # shown by --explain (default: rule-N)
+    reason = "Why this is safe to ignore"      # optional, for humans
+    value = "pay-connector"                    # case-insensitive substring
+    key = "glob:*_REDIRECT_URLS"               # shell-style glob, whole field
+    project = "re:^(a083gt|c4hnrd)-"           # regex, searched within the field
+    service = "namex-solr"                     # Cloud Run service or job name
+
+A scope may also be a list of matchers, any of which may match.
+
+All rules are compiled into a single regex over a record of the four fields
+(project, service, key, value; one per line), one named-group branch per
+rule. Each branch is a set of lookaheads that pin its substring and glob
+matchers to their field, so one `match()` per env var finds the first
+candidate rule and `lastgroup` says which one. A user regex could run past
+the end of its field in that record (`\s`, `[^/]`, ...), so regex scopes are
+left out of the combined regex and every candidate is confirmed field by
+field, each regex searched within its own field only.
+
+Named groups stop the regex engine from using its fast path for literal
+alternations, so that regex only runs once a group-free prefilter has
+matched. The prefilter ORs one scope of every rule (its value scope if it
+has one), merged per field, and turns most env vars away in one cheap pass:
+
+    rules = IgnoreRules.load("silver_envvar_ignore.toml")
+    rule = rules.match(project, service, key, value)   # IgnoreRule | None
+
+Newlines inside a field are treated as spaces. Matching is
+case-insensitive; a regex can opt out with (?-i:...).
+"""
+
+import re
+import tomllib
+from typing import NamedTuple
+
+SCOPES = ("project", "service", "key", "value")  # record field order
+ANCHOR_SCOPES = ("value", "key", "service", "project")  # prefilter preference
+FLAGS = re.IGNORECASE | re.MULTILINE
+RULE_KEYS = {"id", "reason", *SCOPES}
+
+
+class IgnoreRule(NamedTuple):
+    id: str
+    reason: str
+    scopes: dict[str, list[str]]
+
+    def __str__(self) -> str:
+        return self.id
+
+
+def _glob_to_regex(glob: str) -> str:
+    """Translate a shell-style glob into a regex that stays inside one field."""
+    out, i = [], 0
+    while i < len(glob):
+        c = glob[i]
+        if c == "*":
+            out.append(r"[^\n]*")
+        elif c == "?":
+            out.append(r"[^\n]")
+        elif c == "[" and glob.find("]", i + 2) != -1:
+            end = glob.find("]", i + 2)
+            body = glob[i + 1:end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(rf"(?!\n)[{body}]")
+            i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out) + "$"
+
+
+def _plain_regex(matchers: list[str]) -> str:
+    """Regex matching at the start of a field when any substring or glob matcher hits it.
+
+    Plain substrings share one literal alternation, which the regex engine
+    scans much faster than one branch per substring. Neither form can match
+    past a newline, so the result is safe to use inside the record.
+    """
+    literals = [re.escape(m) for m in dict.fromkeys(matchers) if not m.startswith(("re:", "glob:"))]
+    alternatives = [r"[^\n]*?(?:" + "|".join(literals) + ")"] if literals else []
+    alternatives += [_glob_to_regex(m[5:]) for m in dict.fromkeys(matchers) if m.startswith("glob:")]
+    return f"(?:{'|'.join(alternatives)})"
+
+
+def _record_regex(scope: str, matchers: list[str]) -> str | None:
+    """Regex matching at the start of a record when field `scope` may satisfy `matchers`.
+
+    None for scopes with a regex matcher: those are only checked per field.
+    """
+    if any(m.startswith("re:") for m in matchers):
+        return None
+    return r"(?:[^\n]*\n)" * SCOPES.index(scope) + _plain_regex(matchers)
+
+
+def _field_checks(matchers: list[str]) -> list:
+    """Match/search callables that test one field on its own; any may succeed."""
+    plain = [m for m in matchers if not m.startswith("re:")]
+    checks = [re.compile(_plain_regex(plain), FLAGS).match] if plain else []
+    return checks + [re.compile(m[3:], FLAGS).search for m in matchers if m.startswith("re:")]
+
+
+class IgnoreRules:
+    """An ordered list of ignore rules, compiled once into a single matcher."""
+
+    def __init__(self, rules: list[IgnoreRule]):
+        self.rules = rules
+        self._all = self._compile(rules)
+        # For callers that don't know the value yet (e.g. secret-backed env
+        # vars before they are read): only rules without a value scope apply
+        self._keyed = self._compile([r for r in rules if "value" not in r.scopes])
+
+    @classmethod
+    def load(cls, path: str) -> "IgnoreRules":
+        """Parse and validate a rules file; raises ValueError naming the bad rule."""
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+        unknown = set(data) - {"rule"}
+        if unknown:
+            raise ValueError(f"{path}: unknown top-level keys {sorted(unknown)}")
+        return cls.from_dicts(data.get("rule", []), source=path)
+
+    @classmethod
+    def from_dicts(cls, tables: list[dict], source: str = "<rules>") -> "IgnoreRules":
+        rules, ids = [], set()
+        for n, table in enumerate(tables, 1):
+            rule_id = str(table.get("id") or f"rule-{n}")
+            where = f"{source}: rule {rule_id!r}"
+            unknown = set(table) - RULE_KEYS
+            if unknown:
+                raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+            if rule_id in ids:
+                raise ValueError(f"{where}: duplicate id")
+            ids.add(rule_id)
+
+            scopes = {}
+            for scope in SCOPES:
+                if scope not in table:
+                    continue
+                matchers = table[scope] if isinstance(table[scope], list) else [table[scope]]
+                if not matchers or not all(isinstance(m, str) and m for m in matchers):
+                    raise ValueError(f"{where}: {scope} must be a non-empty string or list of strings")
+                for m in matchers:
+                    try:
+                        re.compile(m[3:] if m.startswith("re:") else _plain_regex([m]))
+                    except re.error as e:
+                        raise ValueError(f"{where}: bad {scope} matcher {m!r}: {e}") from None
+                scopes[scope] = matchers
+            if not scopes:
+                raise ValueError(f"{where}: needs at least one of {', '.join(SCOPES)}")
+            rules.append(IgnoreRule(rule_id, str(table.get("reason", "")), scopes))
+        return cls(rules)
+
+    @staticmethod
+    def _compile(rules: list[IgnoreRule]) -> tuple[re.Pattern, re.Pattern, list] | None:
+        """(prefilter, candidate regex, [(rule, per-field checks)]), or None when there are no rules.
+
+        Both regexes only leave out constraints (regex scopes), never add
+        them, so they can yield false candidates but never miss a rule.
+        """
+        if not rules:
+            return None
+        anchors: dict[str, list[str]] = {}
+        unanchored = False
+        branches, candidates = [], []
+        for n, rule in enumerate(rules):
+            plain = {s: _record_regex(s, ms) for s, ms in rule.scopes.items()}
+            anchor = next((s for s in ANCHOR_SCOPES if plain.get(s)), None)
+            if anchor:
+                anchors.setdefault(anchor, []).extend(rule.scopes[anchor])
+            else:
+                unanchored = True
+            lookaheads = "".join(f"(?={r})" for r in plain.values() if r)
+            branches.append(f"(?P<_rule{n}>{lookaheads})")
+            checks = [(SCOPES.index(s), _field_checks(ms)) for s, ms in rule.scopes.items()]
+            candidates.append((rule, checks))
+        prefilter = "|".join(_record_regex(s, ms) for s, ms in anchors.items())
+        return re.compile("" if unanchored else prefilter, FLAGS), re.compile("|".join(branches), FLAGS), candidates
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, project: str, service: str, key: str, value: str | None = None) -> IgnoreRule | None:
+        """First rule that suppresses this env var, or None.
+
+        With `value=None`, rules that scope on the value are not considered.
+        """
+        compiled = self._keyed if value is None else self._all
+        if compiled is None:
+            return None
+        prefilter, regex, candidates = compiled
+        fields = [f.replace("\n", " ") for f in (project, service, key, value or "")]
+        record = "\n".join(fields)
+        if not prefilter.match(record):
+            return None
+        m = regex.match(record)
+        if not m:
+            return None
+        # Earlier rules failed even the looser combined regex; confirm from here on
+        for rule, checks in candidates[int(m.lastgroup.removeprefix("_rule")):]:
+            if all(any(check(fields[i]) for check in field_checks) for i, field_checks in checks):
+                return rule
+        return None
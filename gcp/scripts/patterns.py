@@ -0,0 +1,79 @@
+"""
+Multi-pattern, case-insensitive substring matching shared by the Silver scanners.
+
+Migration audits look for many hostnames at once (silver, gold, specific
+routes, legacy hosts like pay-connector). Instead of one `in` check per
+target per value, a `PatternSet` compiles every target into a single
+alternation that the regex engine runs over the text in one pass:
+
+    patterns = PatternSet(["silver.devops.gov.bc.ca", "pay-connector"])
+    patterns.hits(value)              # ["pay-connector", ...] in pattern order
+    for m in patterns.finditer(text):
+        m.pattern, m.start, m.end
+
+The alternation sits in a lookahead, so it only locates positions where some
+pattern starts; each pattern is then checked at that position. Every
+occurrence of every pattern is reported, including ones that overlap
+(e.g. "apps.silver" inside "api.apps.silver.devops.gov.bc.ca" when both are
+targets). Matching is case-insensitive without lowering copies of the text.
+"""
+
+import re
+from typing import Iterator, NamedTuple
+
+
+class PatternMatch(NamedTuple):
+    pattern: str
+    start: int
+    end: int
+
+
+def split_targets(values: list[str] | None, default: str) -> list[str]:
+    """Flatten repeatable, comma-separated --target values; fall back to `default`."""
+    targets = [t.strip() for v in values or [default] for t in v.split(",")]
+    return [t for t in targets if t]
+
+
+class PatternSet:
+    """A fixed set of literal patterns matched case-insensitively in one pass."""
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        if not self.patterns:
+            raise ValueError("PatternSet needs at least one non-empty pattern")
+        # Longest first, so the candidate scan prefers the most specific pattern
+        alternation = "|".join(
+            re.escape(p) for p in sorted(self.patterns, key=len, reverse=True)
+        )
+        self._candidates = re.compile(f"(?=(?:{alternation}))", re.IGNORECASE)
+        self._each = [(p, re.compile(re.escape(p), re.IGNORECASE)) for p in self.patterns]
+        self.max_length = max(len(p) for p in self.patterns)
+
+    @property
+    def key(self) -> str:
+        """Stable identifier of the set, for caching results per pattern set."""
+        return "\n".join(sorted(self.patterns))
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __str__(self) -> str:
+        return ", ".join(self.patterns)
+
+    def finditer(self, text: str, pos: int = 0) -> Iterator[PatternMatch]:
+        """Yield every occurrence of every pattern from `pos`, ordered by start."""
+        for candidate in self._candidates.finditer(text, pos):
+            start = candidate.start()
+            for pattern, regex in self._each:
+                m = regex.match(text, start)
+                if m:
+                    yield PatternMatch(pattern, start, m.end())
+
+    def search(self, text: str) -> PatternMatch | None:
+        """Return the first occurrence of any pattern, or None."""
+        return next(self.finditer(text), None)
+
+    def hits(self, text: str) -> list[str]:
+        """Patterns that occur anywhere in `text`, in pattern order."""
+        found = {m.pattern for m in self.finditer(text)}
+        return [p for p in self.patterns if p in found]
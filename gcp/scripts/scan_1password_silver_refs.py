@@ -1,7 +1,7 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "httpx",
+#     "httpx[http2]",
 #     "python-dotenv",
 # ]
 # ///
@@ -11,6 +11,34 @@ the OpenShift Silver cluster (silver.devops.gov.bc.ca).
 
 Authentication uses the 1Password Connect API — no `op` CLI sign-in needed.
 
+Vault listings and item details are fetched concurrently by an async
+Connect client (--concurrency requests in flight over a pooled HTTP/2
+connection). 429, 5xx and transport errors are retried with jittered
+exponential backoff, honouring Retry-After. A circuit breaker pauses
+requests for a cool-down after repeated 5xx / transport failures; queued
+requests wait the cool-down out and retry rather than failing. A 429 is
+throttling, not an outage: it is retried on its own budget and never trips
+the breaker. Request latency percentiles are printed with the results.
+Results are reported in vault and item order regardless of completion
+order.
+
+Every run records each item's Connect `version` and its (masked) matches
+under output/.cache/state/. With --incremental, items whose version and the
+target set are unchanged reuse those matches and are never fetched, so a
+rescan of an unchanged vault costs only the vault and item listings. Stored
+matches hold only what a masked report shows; with --show-values, items
+that had matches are fetched again for their plaintext values.
+
+Each run also maintains a host index (output/.cache/state/1password_index.json):
+for every vault / item / field that mentions a host, the normalized
+hostnames plus keyed HMAC-SHA256 fingerprints of the field value and of each
+URL in it. It holds no secret values; the HMAC key comes from OP_INDEX_KEY
+or a generated output/.cache/1password_index.key. Follow-up questions are
+answered from the index alone, with no Connect credentials or API calls:
+--query takes a substring ("gold.devops") or a glob over leading host
+labels ("*.apps.silver"), and --query-value reads exact values from stdin
+and finds the fields holding them by fingerprint.
+
 Required environment variables (export or add to .env):
     OP_CONNECT_HOST   <your Connect API endpoint>
     OP_CONNECT_TOKEN  <your Connect API token>
@@ -18,20 +46,37 @@ Required environment variables (export or add to .env):
 Usage:
     uv run scan_1password_silver_refs.py
     uv run scan_1password_silver_refs.py --target gold.devops.gov.bc.ca
+    uv run scan_1password_silver_refs.py --target silver.devops.gov.bc.ca --target pay-connector
     uv run scan_1password_silver_refs.py --vaults "DevOps" "Shared"
     uv run scan_1password_silver_refs.py --output /tmp/1p_silver.md
     uv run scan_1password_silver_refs.py --show-values
+    uv run scan_1password_silver_refs.py --concurrency 16 --timeout 60
+    uv run scan_1password_silver_refs.py --incremental
+    uv run scan_1password_silver_refs.py --query gold.devops --query "*.apps.silver"
+    echo "postgres://user:pw@db.example/x" | uv run scan_1password_silver_refs.py --query-value
 """
 
 import argparse
+import asyncio
+import fnmatch
+import hashlib
+import hmac
 import os
+import random
+import re
+import secrets
+import statistics
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
 import httpx
 from dotenv import load_dotenv
 
+from patterns import PatternSet, split_targets
+from state import StateStore
+
 # ── Defaults ──────────────────────────────────────────────────────────────────
 DEFAULT_TARGET = "silver.devops.gov.bc.ca"
 OUTPUT_DIR = Path(__file__).parent / "output"
@@ -41,50 +86,258 @@ SKIP_FIELD_TYPES = {"TOTP", "OTP", "totp", "otp", "DATE", "MONTH_YEAR"}
 
 CONTEXT_WINDOW = 120  # chars of context around each match
 
+DEFAULT_CONCURRENCY = 8  # Connect API requests in flight
+DEFAULT_TIMEOUT = 30  # Seconds per request (connect capped at 10)
+KEEPALIVE_EXPIRY = 30  # Seconds an idle pooled connection is kept
+MAX_RETRIES = 4  # Retries per request on 5xx / transport errors
+MAX_THROTTLED_RETRIES = 20  # Retries for 429s, separate from MAX_RETRIES
+BACKOFF_SECONDS = 1  # Base delay, doubled on each retry (full jitter)
+MAX_BACKOFF_SECONDS = 30
+CIRCUIT_FAILURE_THRESHOLD = 10  # Consecutive failed attempts that open the circuit
+CIRCUIT_RESET_SECONDS = 30  # Cool-down before a probe request is let through
+CIRCUIT_MAX_COOLDOWNS = 3  # Cool-downs a request waits out before giving up
+CIRCUIT_PROBE_POLL_SECONDS = 1  # How often waiting requests check on an in-flight probe
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+STATE_VERSION = 1  # Bump when the stored per-item entries change shape
+INDEX_VERSION = 2  # Bump when the host index entries change shape or meaning
+INDEX_KEY_PATH = OUTPUT_DIR / ".cache" / "1password_index.key"
+
+# Host of any scheme://[userinfo@]host URL; userinfo is skipped, never stored.
+# It runs to the last @ before the path, since passwords may hold a raw @.
+URL_HOST_PATTERN = re.compile(
+    r"\b[a-z][a-z0-9+.-]*://(?:[^/\s]*@)?([a-z0-9](?:[a-z0-9.-]*[a-z0-9])?)", re.IGNORECASE
+)
+# Bare dotted hostnames with at least three labels (e.g. db.apps.gold.devops.gov.bc.ca)
+BARE_HOST_PATTERN = re.compile(
+    r"(?<![\w@.-])(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.){2,}[a-z]{2,63}(?![\w.-])",
+    re.IGNORECASE,
+)
+
 
 # ── 1Password Connect client ──────────────────────────────────────────────────
 
 
-class ConnectClient:
-    """Thin wrapper around the 1Password Connect REST API."""
+class CircuitBreaker:
+    """Fail fast once Connect keeps failing, then let a single probe through.
+
+    After `threshold` consecutive failed requests the circuit opens and
+    requests are held back without touching the network. Once `reset_after`
+    seconds have passed, one probe request is allowed: success closes the
+    circuit, failure re-opens it for another cool-down.
+    """
+
+    def __init__(self, threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_after: float = CIRCUIT_RESET_SECONDS):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trips = 0  # times the circuit opened or a probe failed
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self.opened_at < self.reset_after:
+            return False
+        self._probing = True
+        return True
+
+    def retry_in(self) -> float:
+        """Seconds a held-back request should wait before asking again."""
+        if self.opened_at is None:
+            return 0.0
+        remaining = self.opened_at + self.reset_after - time.monotonic()
+        return max(remaining, CIRCUIT_PROBE_POLL_SECONDS if self._probing else 0.0)
+
+    def release_probe(self):
+        """The probe ended without a verdict (e.g. throttled or crashed); let another through."""
+        self._probing = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; True if this failure opened the circuit."""
+        self.failures += 1
+        was_open = self.is_open and not self._probing
+        self._probing = False
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            if not was_open:
+                self.trips += 1
+            return not was_open
+        return False
+
+
+class LatencyStats:
+    """Per-request latency and outcome counters for the Connect API."""
+
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def record(self, seconds: float):
+        self.latencies.append(seconds)
+
+    def summary(self) -> str:
+        if not self.latencies:
+            return f"0 requests, {self.rejected} rejected by circuit breaker"
+        ms = sorted(s * 1000 for s in self.latencies)
+        p50, p95 = (statistics.quantiles(ms, n=100)[i] for i in (49, 94)) if len(ms) > 1 else (ms[0], ms[0])
+        return (
+            f"{len(ms)} requests, p50 {p50:.0f} ms, p95 {p95:.0f} ms, max {ms[-1]:.0f} ms, "
+            f"{self.retries} retries, {self.failures} failed, {self.rejected} rejected"
+        )
 
-    def __init__(self, host: str, token: str):
+
+class ConnectClient:
+    """Async client for the 1Password Connect REST API.
+
+    One pooled httpx.AsyncClient (HTTP/2 when the server offers it) serves
+    every request. 429, 5xx and transport errors are retried with
+    exponential backoff and full jitter, honouring Retry-After. Every
+    attempt's latency is recorded in `stats`, and a `CircuitBreaker` stops
+    a failing Connect server from being hammered by thousands of queued
+    item reads. Failed requests return None / [] as before.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        max_connections: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        breaker: CircuitBreaker | None = None,
+    ):
         self._base = host.rstrip("/")
-        self._client = httpx.Client(
+        self._client = httpx.AsyncClient(
             headers={
                 "Authorization": f"Bearer {token}",
                 "Content-Type": "application/json",
             },
-            timeout=30,
+            http2=True,
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 10)),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
         )
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = LatencyStats()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
 
-    def _get(self, path: str) -> list | dict | None:
+    @staticmethod
+    def _retry_delay(resp: httpx.Response | None, attempt: int) -> float:
+        """Seconds to wait before retry `attempt`: Retry-After, else jittered exponential backoff."""
+        retry_after = resp.headers.get("Retry-After", "") if resp is not None else ""
+        if retry_after.isdigit():
+            return float(retry_after)
+        return random.uniform(0, min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2**attempt))
+
+    async def _get(self, path: str) -> list | dict | None:
         url = f"{self._base}{path}"
-        try:
-            resp = self._client.get(url)
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.HTTPStatusError as exc:
-            print(f"  ⚠️  HTTP {exc.response.status_code} for {url}")
-            return None
-        except Exception as exc:
-            print(f"  ⚠️  Request failed for {url}: {exc}")
-            return None
-
-    def list_vaults(self) -> list[dict]:
-        data = self._get("/v1/vaults")
-        return data if isinstance(data, list) else []
+        first_trip = None
+        attempt = throttled_retries = 0
+        while attempt <= MAX_RETRIES:
+            if not self.breaker.allow():
+                # Wait the cool-down out instead of failing the request
+                if first_trip is None:
+                    first_trip = self.breaker.trips
+                if self.breaker.trips - first_trip >= CIRCUIT_MAX_COOLDOWNS:
+                    self.stats.rejected += 1
+                    print(f"  ⚠️  Request failed for {url}: circuit still open")
+                    return None
+                await asyncio.sleep(self.breaker.retry_in())
+                continue
 
-    def list_items(self, vault_id: str) -> list[dict]:
-        data = self._get(f"/v1/vaults/{vault_id}/items")
+            resp = error = None
+            started = time.perf_counter()
+            try:
+                resp = await self._client.get(url)
+            except httpx.TransportError as exc:
+                error = exc
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            finally:
+                self.stats.record(time.perf_counter() - started)
+
+            retryable = error is not None or resp.status_code in RETRY_STATUSES
+            if not retryable:
+                self.breaker.record_success()
+                if resp.status_code >= 400:
+                    print(f"  ⚠️  HTTP {resp.status_code} for {url}")
+                    return None
+                try:
+                    return resp.json()
+                except ValueError as exc:
+                    print(f"  ⚠️  Request failed for {url}: {exc}")
+                    return None
+
+            throttled = resp is not None and resp.status_code == 429
+            if throttled and throttled_retries < MAX_THROTTLED_RETRIES:
+                # Connect is pacing us, not failing; back off without tripping the breaker
+                self.breaker.release_probe()
+                self.stats.retries += 1
+                await asyncio.sleep(self._retry_delay(resp, throttled_retries))
+                throttled_retries += 1
+                continue
+            if self.breaker.record_failure():
+                print(
+                    f"  ⚠️  Connect is failing; pausing requests for "
+                    f"{self.breaker.reset_after:.0f}s (circuit open)"
+                )
+            if attempt < MAX_RETRIES:
+                self.stats.retries += 1
+                await asyncio.sleep(self._retry_delay(resp, attempt))
+            attempt += 1
+
+        self.stats.failures += 1
+        reason = f"HTTP {resp.status_code}" if resp is not None else f"{error}"
+        print(f"  ⚠️  Request failed for {url}: {reason}")
+        return None
+
+    async def list_vaults(self) -> list[dict]:
+        data = await self._get("/v1/vaults")
         return data if isinstance(data, list) else []
 
-    def get_item(self, vault_id: str, item_id: str) -> dict | None:
-        data = self._get(f"/v1/vaults/{vault_id}/items/{item_id}")
+    async def list_items(self, vault_id: str) -> list[dict] | None:
+        """Item stubs in the vault, or None if they could not be listed."""
+        data = await self._get(f"/v1/vaults/{vault_id}/items")
+        return data if isinstance(data, list) else None
+
+    async def get_item(self, vault_id: str, item_id: str) -> dict | None:
+        data = await self._get(f"/v1/vaults/{vault_id}/items/{item_id}")
         return data if isinstance(data, dict) else None
 
-    def close(self):
-        self._client.close()
+    async def get_items(
+        self, refs: list[tuple[str, str]], max_concurrency: int = DEFAULT_CONCURRENCY
+    ) -> list[dict | None]:
+        """Fetch many (vault_id, item_id) details concurrently, in `refs` order."""
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(ref: tuple[str, str]) -> dict | None:
+            async with slots:
+                return await self.get_item(*ref)
+
+        return await asyncio.gather(*(fetch(ref) for ref in refs))
+
+    async def close(self):
+        await self._client.aclose()
 
 
 # ── Scanning helpers ───────────────────────────────────────────────────────────
@@ -96,33 +349,33 @@ def extract_context(text: str, index: int, window: int = CONTEXT_WINDOW) -> str:
     return text[start:end].replace("\n", " ").replace("\r", "").strip()
 
 
-def mask_value(value: str, target: str) -> str:
-    """Show only the portion around the target; redact the rest."""
-    idx = value.lower().find(target.lower())
-    if idx == -1:
+def mask_value(value: str, patterns: PatternSet) -> str:
+    """Show only the portion around the first target match; redact the rest."""
+    m = patterns.search(value)
+    if m is None:
         return "[REDACTED]"
-    start = max(0, idx - 40)
-    end = min(len(value), idx + len(target) + 40)
+    start = max(0, m.start - 40)
+    end = min(len(value), m.end + 40)
     snippet = value[start:end]
     return f"{'...' if start > 0 else ''}{snippet}{'...' if end < len(value) else ''}"
 
 
-def scan_item(item: dict, target: str, show_values: bool) -> list[dict]:
-    """Return a list of match dicts for every field value containing target."""
+def scan_item(item: dict, patterns: PatternSet, show_values: bool) -> list[dict]:
+    """Return a list of match dicts for every field value containing a target."""
     matches: list[dict] = []
-    target_lower = target.lower()
 
     # Check the item's URL list
     for url_entry in item.get("urls", []):
         href = url_entry.get("href", "")
-        if target_lower in href.lower():
-            idx = href.lower().find(target_lower)
+        hits = patterns.hits(href)
+        if hits:
             matches.append(
                 {
                     "field_label": "[URL entry]",
                     "field_type": "URL",
-                    "value_display": href if show_values else mask_value(href, target),
-                    "context": extract_context(href, idx),
+                    "value_display": href if show_values else mask_value(href, patterns),
+                    "context": extract_context(href, patterns.search(href).start),
+                    "patterns": hits,
                 }
             )
 
@@ -136,8 +389,8 @@ def scan_item(item: dict, target: str, show_values: bool) -> list[dict]:
         if not isinstance(value, str) or not value:
             continue
 
-        if target_lower in value.lower():
-            idx = value.lower().find(target_lower)
+        hits = patterns.hits(value)
+        if hits:
             label = field.get("label") or field.get("id") or ftype or "unknown"
             matches.append(
                 {
@@ -145,18 +398,140 @@ def scan_item(item: dict, target: str, show_values: bool) -> list[dict]:
                     "field_type": ftype,
                     "value_display": value
                     if show_values
-                    else mask_value(value, target),
-                    "context": extract_context(value, idx),
+                    else mask_value(value, patterns),
+                    "context": extract_context(value, patterns.search(value).start),
+                    "patterns": hits,
                 }
             )
 
     return matches
 
 
+# ── Host index ────────────────────────────────────────────────────────────────
+
+
+def load_index_key() -> bytes:
+    """HMAC key for index fingerprints: OP_INDEX_KEY, else a generated local key file."""
+    env_key = os.environ.get("OP_INDEX_KEY", "").strip()
+    if env_key:
+        return env_key.encode()
+    try:
+        return bytes.fromhex(INDEX_KEY_PATH.read_text().strip())
+    except (OSError, ValueError):
+        pass
+    key = secrets.token_bytes(32)
+    INDEX_KEY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(INDEX_KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(key.hex())
+    return key
+
+
+def fingerprint(key: bytes, value: str) -> str:
+    return hmac.new(key, value.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def extract_hosts(value: str, bare: bool) -> list[str]:
+    """Normalized hostnames mentioned in `value`, in first-seen order.
+
+    Hosts are taken from URLs, and also from bare dotted names when `bare`
+    is set. Concealed fields pass bare=False, so a password that merely
+    looks like a hostname is never copied into the index.
+    """
+    hosts = [m.group(1) for m in URL_HOST_PATTERN.finditer(value)]
+    if bare:
+        hosts += [m.group(0) for m in BARE_HOST_PATTERN.finditer(value)]
+    return list(dict.fromkeys(h.lower().rstrip(".") for h in hosts))
+
+
+def index_item(item: dict, key: bytes) -> list[dict]:
+    """Index rows for the item's URL entries and fields that mention a host."""
+    rows = []
+    values = [("[URL entry]", "URL", u.get("href", "")) for u in item.get("urls", [])]
+    for field in item.get("fields", []):
+        ftype = field.get("type", "")
+        if ftype in SKIP_FIELD_TYPES:
+            continue
+        label = field.get("label") or field.get("id") or ftype or "unknown"
+        values.append((label, ftype, field.get("value", "")))
+
+    for label, ftype, value in values:
+        if not isinstance(value, str) or not value:
+            continue
+        hosts = extract_hosts(value, bare=ftype != "CONCEALED")
+        if not hosts:
+            continue
+        urls = [m.group(0) for m in re.finditer(r"\b[a-z][a-z0-9+.-]*://\S+", value, re.IGNORECASE)]
+        rows.append(
+            {
+                "field": label,
+                "type": ftype,
+                "hosts": hosts,
+                "value_hmac": fingerprint(key, value),
+                "url_hmacs": [fingerprint(key, u) for u in dict.fromkeys(urls)],
+            }
+        )
+    return rows
+
+
+def host_matches(host: str, query: str) -> bool:
+    """Substring match, or for a glob, a match on the whole host or its leading labels."""
+    if not any(c in query for c in "*?["):
+        return query in host
+    labels = host.split(".")
+    return any(fnmatch.fnmatchcase(".".join(labels[:n]), query) for n in range(1, len(labels) + 1))
+
+
+def query_index(items: dict, queries: list[str], value_hmacs: set[str]) -> list[tuple[dict, dict, list[str]]]:
+    """Return (item entry, field row, matched hosts) for rows matching any query or fingerprint."""
+    queries = [q.lower() for q in queries]
+    results = []
+    for entry in items.values():
+        for row in entry["fields"]:
+            hosts = [h for h in row["hosts"] if any(host_matches(h, q) for q in queries)]
+            by_value = row["value_hmac"] in value_hmacs or value_hmacs.intersection(row["url_hmacs"])
+            if hosts or by_value:
+                results.append((entry, row, hosts))
+    return sorted(results, key=lambda r: (r[0]["vault"], r[0]["item"], r[1]["field"]))
+
+
+def run_query(queries: list[str], query_values: bool):
+    """Answer --query / --query-value from the saved index and print the matches."""
+    index = StateStore("1password_index", version=INDEX_VERSION).load()
+    items = index.get("items", {})
+    if not items:
+        print("❌  No host index yet. Run a scan first.")
+        sys.exit(1)
+
+    value_hmacs: set[str] = set()
+    if query_values:
+        key = load_index_key()
+        if fingerprint(key, "key-id") != index.get("key_id"):
+            print("❌  The index was built with a different HMAC key (OP_INDEX_KEY).")
+            sys.exit(1)
+        value_hmacs = {fingerprint(key, line.rstrip("\r\n")) for line in sys.stdin if line.strip()}
+
+    results = query_index(items, queries, value_hmacs)
+    with_hosts = sum(1 for e in items.values() if e["fields"])
+    print(f"\n  Index: {len(items)} item(s), {with_hosts} with host references")
+    if queries:
+        print(f"  Hosts: {', '.join(queries)}")
+    if query_values:
+        print(f"  Values: {len(value_hmacs)} fingerprint(s) from stdin")
+    print(f"  Matches: {len(results)} field(s)\n")
+    for entry, row, hosts in results:
+        shown = ", ".join(hosts) if hosts else "(exact value match)"
+        print(f"  📂 {entry['vault']}  🔑 {entry['item']!r}  [{row['field']}]  {shown}")
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 
-def main():
+async def _gather(*aws):
+    return await asyncio.gather(*aws)
+
+
+def main(argv: list[str] | None = None):
     load_dotenv()
 
     parser = argparse.ArgumentParser(
@@ -164,8 +539,9 @@ def main():
     )
     parser.add_argument(
         "--target",
-        default=DEFAULT_TARGET,
-        help=f"Substring to search for (default: {DEFAULT_TARGET})",
+        action="append",
+        metavar="PATTERN",
+        help=f"Substring to search for; repeat or comma-separate for several (default: {DEFAULT_TARGET})",
     )
     parser.add_argument(
         "--vaults",
@@ -188,7 +564,39 @@ def main():
         action="store_true",
         help="Print to stdout only; skip writing the Markdown report",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Connect API requests in flight (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Seconds per Connect API request (default: {DEFAULT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch items whose version changed since the last run; reuse stored matches for the rest",
+    )
+    parser.add_argument(
+        "--query",
+        action="append",
+        metavar="HOST",
+        help="Look up a hostname substring or glob (e.g. '*.apps.silver') in the local index; no API calls",
+    )
+    parser.add_argument(
+        "--query-value",
+        action="store_true",
+        help="Read exact values from stdin (one per line) and find them in the local index by HMAC fingerprint",
+    )
+    args = parser.parse_args(argv)
+
+    if args.query or args.query_value:
+        run_query(args.query or [], args.query_value)
+        return
 
     # ── Auth ──────────────────────────────────────────────────────────────────
     connect_host = os.environ.get("OP_CONNECT_HOST", "").strip()
@@ -205,8 +613,9 @@ def main():
         print("\n  Export them or add them to .env and retry.")
         sys.exit(1)
 
-    target: str = args.target
+    patterns = PatternSet(split_targets(args.target, DEFAULT_TARGET))
     show_values: bool = args.show_values
+    concurrency = max(1, args.concurrency)
     today = datetime.now().strftime("%Y-%m-%d")
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -221,15 +630,19 @@ def main():
     print(f"  1Password Connect  —  Silver Reference Scanner")
     print(f"{'=' * 64}")
     print(f"  Connect host : {connect_host}")
-    print(f"  Target       : {target}")
+    print(f"  Targets      : {patterns}")
     print(f"  Vaults       : {', '.join(args.vaults) if args.vaults else 'ALL'}")
     print(f"  Output       : {output_path}")
     print(f"{'=' * 64}\n")
 
-    client = ConnectClient(connect_host, connect_token)
+    # One event loop drives every Connect call so the client's pool is reused
+    runner = asyncio.Runner()
+    client = ConnectClient(
+        connect_host, connect_token, max_connections=concurrency, timeout=args.timeout
+    )
 
     # ── Discover vaults ───────────────────────────────────────────────────────
-    all_vaults = client.list_vaults()
+    all_vaults = runner.run(client.list_vaults())
     if not all_vaults:
         print("❌  No vaults returned. Check OP_CONNECT_HOST and OP_CONNECT_TOKEN.")
         sys.exit(1)
@@ -253,12 +666,62 @@ def main():
     total_matches = 0
     errors = 0
 
-    for vault in vaults:
+    # List every vault's items, then fetch all item details, concurrently
+    vault_items = runner.run(_gather(*(client.list_items(v.get("id", "")) for v in vaults)))
+    state = StateStore("1password_items", version=STATE_VERSION)
+    stored = state.load()
+    previous = stored if args.incremental else {}
+    index_key = load_index_key()
+    key_id = fingerprint(index_key, "key-id")
+    index = StateStore("1password_index", version=INDEX_VERSION)
+    previous_index = index.load()
+    if previous_index.get("key_id") != key_id:
+        previous_index = {}
+    # Vaults not scanned this run (not selected, or their items could not be
+    # listed) keep their state and index entries
+    scanned_vault_ids = {
+        v.get("id", "") for v, items in zip(vaults, vault_items) if items is not None
+    }
+    new_state: dict[str, dict] = {
+        k: e for k, e in stored.items() if k.split("/")[0] not in scanned_vault_ids
+    }
+    new_index = {
+        k: e for k, e in previous_index.get("items", {}).items()
+        if k.split("/")[0] not in scanned_vault_ids
+    }
+
+    # Same version and targets: the stored (masked) matches are still valid
+    reused: dict[str, list[dict]] = {}
+    refs = []
+    for vault, items in zip(vaults, vault_items):
+        for stub in items or []:
+            ref = (vault.get("id", ""), stub.get("id", ""))
+            entry = previous.get("/".join(ref))
+            if (
+                entry
+                and stub.get("version") is not None
+                and entry["version"] == stub["version"]
+                and entry["patterns"] == patterns.key
+                and not (show_values and entry["matches"])
+                and "/".join(ref) in previous_index.get("items", {})
+            ):
+                reused["/".join(ref)] = entry["matches"]
+            else:
+                refs.append(ref)
+    if args.incremental:
+        print(f"  Incremental: {len(reused)} item(s) unchanged since last run")
+    print(f"  Fetching {len(refs)} item(s), {concurrency} at a time...\n")
+    details = dict(zip(refs, runner.run(client.get_items(refs, max_concurrency=concurrency))))
+
+    for vault, items in zip(vaults, vault_items):
         vault_id = vault.get("id", "")
         vault_name = vault.get("name", vault_id)
 
         print(f"  📂  Vault: {vault_name!r}")
-        items = client.list_items(vault_id)
+        if items is None:
+            errors += 1
+            print(f"       ⚠️  Could not list items; keeping the previous results.\n")
+            continue
         print(f"       {len(items)} item(s)")
 
         vault_findings: dict[str, list[dict]] = {}
@@ -267,13 +730,34 @@ def main():
             item_id = stub.get("id", "")
             item_title = stub.get("title", item_id)
 
-            detail = client.get_item(vault_id, item_id)
-            if detail is None:
-                errors += 1
-                continue
+            key = f"{vault_id}/{item_id}"
+            if key in reused:
+                matches = reused[key]
+                new_state[key] = previous[key]
+                new_index[key] = previous_index["items"][key]
+            else:
+                detail = details[(vault_id, item_id)]
+                if detail is None:
+                    errors += 1
+                    if key in previous:
+                        # Keep the old entry; its stale version forces a refetch next run
+                        new_state[key] = previous[key]
+                    if key in previous_index.get("items", {}):
+                        new_index[key] = previous_index["items"][key]
+                    continue
+                matches = scan_item(detail, patterns, show_values)
+                new_state[key] = {
+                    "version": detail.get("version", stub.get("version")),
+                    "patterns": patterns.key,
+                    "matches": scan_item(detail, patterns, False) if show_values else matches,
+                }
+                new_index[key] = {
+                    "vault": vault_name,
+                    "item": item_title,
+                    "fields": index_item(detail, index_key),
+                }
 
             total_items_scanned += 1
-            matches = scan_item(detail, target, show_values)
 
             if matches:
                 vault_findings[item_title] = matches
@@ -289,7 +773,10 @@ def main():
             print(f"       ✅  No matches.")
         print()
 
-    client.close()
+    runner.run(client.close())
+    runner.close()
+    state.save(new_state)
+    index.save({"key_id": key_id, "items": new_index})
 
     # ── Console summary ───────────────────────────────────────────────────────
     print(f"\n{'=' * 64}")
@@ -298,6 +785,8 @@ def main():
     print(f"  Items scanned  : {total_items_scanned}")
     print(f"  Total matches  : {total_matches}")
     print(f"  Errors         : {errors}")
+    print(f"  Connect API    : {client.stats.summary()}")
+    print(f"  Host index     : {len(new_index)} item(s) indexed → {index.path}")
     print(f"{'=' * 64}")
 
     if all_findings:
@@ -306,9 +795,12 @@ def main():
             for item_title, matches in vault_findings.items():
                 print(f"     🔑 {item_title!r}")
                 for m in matches:
-                    print(f"        └─ [{m['field_label']}]  {m['value_display']}")
+                    print(
+                        f"        └─ [{m['field_label']}]  {m['value_display']}"
+                        f"  ({', '.join(m['patterns'])})"
+                    )
     else:
-        print(f"\n  ✅  No references to '{target}' found in any vault.")
+        print(f"\n  ✅  No references to '{patterns}' found in any vault.")
 
     # ── Markdown report ───────────────────────────────────────────────────────
     if args.no_report:
@@ -319,7 +811,7 @@ def main():
         "",
         f"**Generated:** {today}  ",
         f"**Connect host:** `{connect_host}`  ",
-        f"**Target:** `{target}`  ",
+        f"**Targets:** {', '.join(f'`{p}`' for p in patterns.patterns)}  ",
         f"**Vaults scanned:** {len(vaults)}  ",
         f"**Items scanned:** {total_items_scanned}  ",
         f"**Total field matches:** {total_matches}  ",
@@ -329,8 +821,8 @@ def main():
         "",
         "## Summary",
         "",
-        "| Vault | Item | Field | Value |",
-        "|:------|:-----|:------|:------|",
+        "| Vault | Item | Field | Pattern | Value |",
+        "|:------|:-----|:------|:--------|:------|",
     ]
 
     if all_findings:
@@ -339,10 +831,11 @@ def main():
                 for m in matches:
                     val = m["value_display"].replace("|", "\\|")[:200]
                     md.append(
-                        f"| {vault_name} | {item_title} | `{m['field_label']}` | `{val}` |"
+                        f"| {vault_name} | {item_title} | `{m['field_label']}` "
+                        f"| {', '.join(m['patterns'])} | `{val}` |"
                     )
     else:
-        md.append("| — | *No matches found* | — | — |")
+        md.append("| — | *No matches found* | — | — | — |")
 
     md += ["", "---", "", "## Per-Vault Detail", ""]
 
@@ -352,18 +845,19 @@ def main():
             for item_title, matches in vault_findings.items():
                 md.append(f"#### 🔑 `{item_title}`\n")
                 md += [
-                    "| Field | Type | Value | Context |",
-                    "|:------|:-----|:------|:--------|",
+                    "| Field | Type | Pattern | Value | Context |",
+                    "|:------|:-----|:--------|:------|:--------|",
                 ]
                 for m in matches:
                     val = m["value_display"].replace("|", "\\|")[:200]
                     ctx = m["context"].replace("|", "\\|")[:150]
                     md.append(
-                        f"| `{m['field_label']}` | {m['field_type']} | `{val}` | `{ctx}` |"
+                        f"| `{m['field_label']}` | {m['field_type']} "
+                        f"| {', '.join(m['patterns'])} | `{val}` | `{ctx}` |"
                     )
                 md.append("")
     else:
-        md.append(f"✅ No references to `{target}` found in any scanned vault.\n")
+        md.append(f"✅ No references to `{patterns}` found in any scanned vault.\n")
 
     md += [
         "---",
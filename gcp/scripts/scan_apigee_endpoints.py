@@ -25,15 +25,16 @@ import sys
 from datetime import datetime
 
 import requests
-import google.auth
 import google.auth.transport.requests
 
+import gcp_clients
+
 APIGEE_BASE = "https://apigee.googleapis.com/v1"
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
 
 
 def get_token() -> str:
-    credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+    credentials, _ = gcp_clients.default_credentials(("https://www.googleapis.com/auth/cloud-platform",))
     credentials.refresh(google.auth.transport.requests.Request())
     return credentials.token
 
@@ -54,11 +55,11 @@ def api_get(token: str, url: str) -> tuple[dict | list | None, str | None]:
         return None, str(e)
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Scan Apigee proxies, target servers, and KVM entries")
     parser.add_argument("--project", required=True, help="GCP project ID (also the Apigee org name)")
     parser.add_argument("--output", help="Output Markdown file path (defaults to output/ folder)")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     project = args.project
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -12,21 +12,46 @@ Generates a consolidated table of all applications across managed bcgov repos.
 Includes app type detection, Python version from Dockerfile, dependency tracking,
 and EOL warnings for both app-level inventory and per-package detail reports.
 
+Repos are scanned concurrently, and each repo's dependency files are fetched
+concurrently. Total in-flight GitHub requests are capped by an adaptive
+limiter that backs off as `x-ratelimit-remaining` drops. File contents are
+cached on disk by blob SHA, so unchanged files are never re-downloaded, and
+repo listings and trees are revalidated with ETags (304s are free).
+
+With --graphql, uncached dependency files from every repo are fetched in a
+handful of batched GraphQL queries instead of one REST call per file.
+
+Every run records each repo's `pushed_at`, HEAD tree SHA and parsed
+dependency files in output/.cache/state/app_inventory.json. With
+--incremental, repos whose `pushed_at` is unchanged are not touched at all,
+repos pushed to without changing the HEAD tree (e.g. other branches) cost
+one tree request, and only the rest are rescanned. Stored results are
+merged back in, so the reports always cover every repo. A repo whose tree
+can't be read keeps its previous entry and is retried. Dependency files that
+can't be read (symlinks, files over 1 MB, binary blobs, failed fetches) are
+skipped and listed; the rest of the repo is still reported, but its result
+is stored without `pushed_at`/`tree_sha` so the next run rescans it.
+
 Usage:
     uv run scan_app_inventory.py
+    uv run scan_app_inventory.py --workers 4
+    uv run scan_app_inventory.py --graphql
+    uv run scan_app_inventory.py --incremental
 """
 
-import base64
+import argparse
 import csv
 import json
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
-import requests
 from dotenv import load_dotenv
 
+from github_client import GitHubClient, StateStore
+
 load_dotenv()
 
 GITHUB_TOKEN = os.getenv("CODEQL_GITHUB_TOKEN")
@@ -34,15 +59,17 @@ if not GITHUB_TOKEN:
     print("Error: CODEQL_GITHUB_TOKEN is not set in .env")
     sys.exit(1)
 
-HEADERS = {
-    "Authorization": f"token {GITHUB_TOKEN}",
-    "Accept": "application/vnd.github.v3+json",
-}
-
 TODAY = datetime.now().strftime("%Y-%m-%d")
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Max GitHub requests in flight; the limiter lowers this as quota runs out
+DEFAULT_WORKERS = 8
+GITHUB = GitHubClient(GITHUB_TOKEN, max_concurrency=DEFAULT_WORKERS)
+
+# Bump when manifest parsing changes so stored per-repo results are discarded
+STATE_VERSION = 1
+
 # ── EOL definitions ───────────────────────────────────────────────────────────
 # Format: package -> [(max_major, max_minor_or_None, eol_date, note), ...]
 EOL_VERSIONS = {
@@ -161,37 +188,6 @@ def check_eol(package: str, version_str: str) -> tuple[bool, str]:
     return False, ""
 
 
-# ── GitHub API helpers ────────────────────────────────────────────────────────
-
-def get_paginated(url: str) -> list:
-    results = []
-    while url:
-        resp = requests.get(url, headers=HEADERS)
-        resp.raise_for_status()
-        results.extend(resp.json())
-        url = resp.links.get("next", {}).get("url")
-    return results
-
-
-def get_file_content(owner: str, repo: str, path: str) -> str | None:
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-    resp = requests.get(url, headers=HEADERS)
-    if resp.status_code != 200:
-        return None
-    data = resp.json()
-    if data.get("encoding") == "base64":
-        return base64.b64decode(data["content"]).decode("utf-8", errors="replace")
-    return None
-
-
-def get_repo_tree(owner: str, repo: str) -> list[str]:
-    url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/HEAD?recursive=1"
-    resp = requests.get(url, headers=HEADERS)
-    if resp.status_code != 200:
-        return []
-    return [item["path"] for item in resp.json().get("tree", []) if item["type"] == "blob"]
-
-
 # ── Dependency file parsers ───────────────────────────────────────────────────
 
 def parse_requirements_txt(content: str) -> dict:
@@ -386,53 +382,142 @@ def should_exclude(repo_name: str, app_name: str) -> bool:
 
 # ── Repo scanner ──────────────────────────────────────────────────────────────
 
-def scan_repo(owner: str, repo: str) -> list[dict]:
-    apps = []
-    tree = get_repo_tree(owner, repo)
+def manifest_kind(path: str) -> str | None:
+    """Return the kind of dependency file at `path`, or None if it isn't one."""
+    basename = os.path.basename(path)
+    if basename == "requirements.txt" or (path.endswith(".txt") and "/requirements/" in path):
+        return "requirements"
+    if basename == "pyproject.toml":
+        return "pyproject"
+    if basename == "Pipfile":
+        return "pipfile"
+    if basename == "package.json" and "node_modules" not in path:
+        return "package_json"
+    if basename == "Dockerfile" or re.match(r'Dockerfile\.\w+', basename):
+        return "dockerfile"
+    return None
+
+
+MANIFEST_PARSERS = {
+    "requirements": parse_requirements_txt,
+    "pyproject": parse_pyproject_toml,
+    "pipfile": parse_pipfile,
+    "package_json": parse_package_json,
+}
+
+
+def find_manifests(tree: dict[str, str]) -> list[tuple[str, str]]:
+    """Return (path, kind) for every dependency file in a repo tree, in tree order."""
+    return [(path, kind) for path in tree if (kind := manifest_kind(path))]
+
+
+def scan_repo(
+    owner: str,
+    repo: str,
+    file_pool: ThreadPoolExecutor | None = None,
+    known_tree: str | None = None,
+) -> tuple[str | None, dict[str, dict] | None, list[str]]:
+    """Scan one repo's dependency files. Files are fetched on `file_pool` if given.
+
+    Returns (tree_sha, subprojects, unreadable paths). If the HEAD tree SHA
+    equals `known_tree`, nothing is fetched and subprojects is None. Raises
+    RuntimeError if the tree can't be read; unreadable files are skipped.
+    """
+    tree_sha, tree = GITHUB.get_repo_tree(owner, repo)
+    if tree_sha is None:
+        raise RuntimeError(f"could not read the tree of {owner}/{repo}")
+    if known_tree and tree_sha == known_tree:
+        return tree_sha, None, []
     if not tree:
-        return apps
+        return tree_sha, {}, []
+
+    manifests = find_manifests(tree)
+    paths = [path for path, _ in manifests]
+    if file_pool is not None:
+        contents = list(file_pool.map(lambda p: GITHUB.get_file_content(owner, repo, p, tree[p]), paths))
+    else:
+        contents = [GITHUB.get_file_content(owner, repo, p, tree[p]) for p in paths]
+    unreadable = [path for path, content in zip(paths, contents) if content is None]
+
+    return tree_sha, parse_manifests(manifests, contents), unreadable
+
+
+def scan_repos_graphql(
+    managed_repos: list[dict],
+    pool: ThreadPoolExecutor,
+    known_trees: dict[str, str] | None = None,
+) -> dict[str, tuple[str | None, dict[str, dict] | None, list[str]]]:
+    """Scan all repos, fetching uncached manifests in batched GraphQL queries.
+
+    Trees still come from REST (ETag-revalidated), then every manifest not in
+    the blob cache, across all repos, is fetched with a few aliased queries.
+    Anything GraphQL can't answer (failed batch, truncated blob) falls back
+    to a REST contents call. Returns {full_name: (tree_sha, subprojects,
+    unreadable paths)} as scan_repo does, including the `known_trees`
+    short-circuit. Repos whose tree couldn't be read are left out, as failures.
+    """
+    known_trees = known_trees or {}
+    names = [r["full_name"] for r in managed_repos]
+    print(f"  Fetching {len(names)} repo trees...")
+    trees = dict(zip(names, pool.map(lambda n: GITHUB.get_repo_tree(*n.split("/")), names)))
+
+    results = {}
+    manifests = {}
+    for name, (tree_sha, tree) in trees.items():
+        if tree_sha is None:
+            continue
+        if known_trees.get(name) and tree_sha == known_trees[name]:
+            results[name] = (tree_sha, None, [])
+        else:
+            manifests[name] = find_manifests(tree)
+
+    files = [
+        (*name.split("/"), path, trees[name][1][path])
+        for name, entries in manifests.items()
+        for path, _ in entries
+    ]
+    contents = GITHUB.fetch_files(files)
+
+    for name, files in manifests.items():
+        owner, repo = name.split("/")
+        texts = [contents.get((owner, repo, path)) for path, _ in files]
+        unreadable = [path for (path, _), text in zip(files, texts) if text is None]
+        results[name] = (trees[name][0], parse_manifests(files, texts), unreadable)
+    return results
+
 
+def parse_manifests(manifests: list[tuple[str, str]], contents) -> dict[str, dict]:
+    """Parse a repo's manifests (with matching `contents`) into {subproject: deps}.
+
+    A Dockerfile's Python version is stored under the `__python_version__` key.
+    """
     subprojects: dict[str, dict] = {}
 
-    for path in tree:
-        basename = os.path.basename(path)
+    # Merge in tree order so later files override earlier ones as before
+    for (path, kind), content in zip(manifests, contents):
+        if not content:
+            continue
         sp = os.path.dirname(path) or "(root)"
 
-        def merge(sp, d):
-            if sp not in subprojects:
-                subprojects[sp] = {}
-            subprojects[sp].update(d)
-
-        if basename == "requirements.txt" or (path.endswith(".txt") and "/requirements/" in path):
-            content = get_file_content(owner, repo, path)
-            if content:
-                merge(sp, parse_requirements_txt(content))
-        elif basename == "pyproject.toml":
-            content = get_file_content(owner, repo, path)
-            if content:
-                merge(sp, parse_pyproject_toml(content))
-        elif basename == "Pipfile":
-            content = get_file_content(owner, repo, path)
-            if content:
-                merge(sp, parse_pipfile(content))
-        elif basename == "package.json" and "node_modules" not in path:
-            content = get_file_content(owner, repo, path)
-            if content:
-                merge(sp, parse_package_json(content))
-        elif basename == "Dockerfile" or re.match(r'Dockerfile\.\w+', basename):
-            content = get_file_content(owner, repo, path)
-            if content:
-                py_ver = parse_dockerfile(content)
-                if py_ver:
-                    if sp not in subprojects:
-                        subprojects[sp] = {}
-                    subprojects[sp]["__python_version__"] = py_ver
+        if kind in MANIFEST_PARSERS:
+            subprojects.setdefault(sp, {}).update(MANIFEST_PARSERS[kind](content))
+        else:
+            py_ver = parse_dockerfile(content)
+            if py_ver:
+                subprojects.setdefault(sp, {})["__python_version__"] = py_ver
+
+    return subprojects
+
 
+def build_apps(owner: str, repo: str, subprojects: dict[str, dict]) -> list[dict]:
+    """Turn parsed subprojects into app records (exclusions, type, tech stack)."""
+    apps = []
     for sp, deps in subprojects.items():
         if not deps:
             continue
         if should_exclude(repo, sp):
             continue
+        deps = dict(deps)
         python_version = deps.pop("__python_version__", None)
         app_type = detect_app_type(sp, deps)
         tech_stack = format_tech_stack(deps, python_version=python_version)
@@ -564,11 +649,33 @@ def write_eol_csv(all_apps: list[dict], filepath: str):
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
-def main():
+def main(argv: list[str] | None = None):
+    global GITHUB
+
+    parser = argparse.ArgumentParser(description="Scan bcgov repos for apps, tech stacks & EOL deps")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Max concurrent GitHub requests (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="Fetch dependency files in batched GraphQL queries instead of one REST call each",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rescan repos changed since the last run; reuse stored results for the rest",
+    )
+    args = parser.parse_args(argv)
+    GITHUB = GitHubClient(GITHUB_TOKEN, max_concurrency=max(1, args.workers))
+
     print("Fetching managed bcgov repos...")
     repos_url = "https://api.github.com/user/repos?type=all&sort=updated&per_page=100"
     try:
-        all_repos = get_paginated(repos_url)
+        all_repos = GITHUB.paginate(repos_url)
     except Exception as e:
         print(f"Error fetching repos: {e}")
         return
@@ -579,18 +686,87 @@ def main():
         and not r.get("archived", False)
     ]
 
-    print(f"Found {len(managed_repos)} active bcgov repos. Scanning...")
+    print(f"Found {len(managed_repos)} active bcgov repos.")
+
+    state = StateStore("app_inventory", version=STATE_VERSION)
+    previous = state.load() if args.incremental else {}
+    known_trees = {name: entry.get("tree_sha") for name, entry in previous.items()}
 
+    # Unchanged pushed_at means no push to any branch: skip the repo entirely
+    scanned: dict[str, tuple[str | None, dict[str, dict] | None, list[str]]] = {}
+    to_scan = []
+    for repo in managed_repos:
+        entry = previous.get(repo["full_name"])
+        if entry and repo.get("pushed_at") and entry.get("pushed_at") == repo["pushed_at"]:
+            scanned[repo["full_name"]] = (entry.get("tree_sha"), None, [])
+        else:
+            to_scan.append(repo)
+    if args.incremental:
+        print(f"  Incremental: {len(scanned)} unchanged since last run, {len(to_scan)} to check")
+    print("Scanning...")
+
+    # Repo and file fetches run on separate pools so a repo task waiting on
+    # its files can never starve the pool those files are queued on.
+    # The limiter, not the pool sizes, bounds actual GitHub concurrency.
+    workers = GITHUB.limiter.max_concurrency
+    with (
+        ThreadPoolExecutor(max_workers=workers) as repo_pool,
+        ThreadPoolExecutor(max_workers=workers * 2) as file_pool,
+    ):
+        if args.graphql:
+            scanned.update(scan_repos_graphql(to_scan, repo_pool, known_trees))
+        else:
+            futures = {
+                repo_pool.submit(
+                    scan_repo,
+                    *repo["full_name"].split("/"),
+                    file_pool,
+                    known_trees.get(repo["full_name"]),
+                ): repo["full_name"]
+                for repo in to_scan
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                full_name = futures[future]
+                sys.stdout.write(
+                    f"\r  [{i}/{len(to_scan)}] {full_name} (concurrency {GITHUB.limiter.limit})...".ljust(80)
+                )
+                sys.stdout.flush()
+                try:
+                    scanned[full_name] = future.result()
+                except Exception:
+                    continue
+
+    # Merge fresh and stored results; keep report order identical to a sequential scan
     all_apps: list[dict] = []
-    for i, repo in enumerate(managed_repos, 1):
+    new_state = {}
+    rescanned = failed = kept = 0
+    unreadable_files: dict[str, list[str]] = {}
+    for repo in managed_repos:
         full_name = repo["full_name"]
-        owner, name = full_name.split("/")
-        sys.stdout.write(f"\r  [{i}/{len(managed_repos)}] {full_name}...".ljust(80))
-        sys.stdout.flush()
-        try:
-            all_apps.extend(scan_repo(owner, name))
-        except Exception:
+        if full_name not in scanned:
+            # Tree unreadable: report the last known results and keep them
+            # stored; their older pushed_at makes the next run retry the repo
+            failed += 1
+            if full_name in previous:
+                kept += 1
+                new_state[full_name] = previous[full_name]
+                all_apps.extend(build_apps(*full_name.split("/"), previous[full_name]["subprojects"]))
             continue
+        tree_sha, subprojects, unreadable = scanned[full_name]
+        if subprojects is None:
+            subprojects = previous[full_name]["subprojects"]
+        else:
+            rescanned += 1
+        if unreadable:
+            unreadable_files[full_name] = unreadable
+        # A partial result is reported but not marked current, so it is rescanned
+        new_state[full_name] = {
+            "pushed_at": None if unreadable else repo.get("pushed_at"),
+            "tree_sha": None if unreadable else tree_sha,
+            "subprojects": subprojects,
+        }
+        all_apps.extend(build_apps(*full_name.split("/"), subprojects))
+    state.save(new_state)
 
     print("\n\nGenerating reports...")
 
@@ -610,6 +786,16 @@ def main():
     print(f"Done!")
     print(f"  Apps found       : {len(all_apps)}")
     print(f"  EOL dependencies : {eol_count}")
+    print(f"  Repos rescanned  : {rescanned}/{len(managed_repos)}")
+    if failed:
+        print(f"  Repos failed     : {failed} (last known results reported for {kept})")
+    if unreadable_files:
+        count = sum(len(paths) for paths in unreadable_files.values())
+        print(f"  Unreadable files : {count} in {len(unreadable_files)} repo(s), skipped")
+        for full_name, paths in unreadable_files.items():
+            print(f"    ⚠️  {full_name}: {', '.join(paths)}")
+    print(f"  File contents    : {GITHUB.blob_cache.summary()}")
+    print(f"  Listings & trees : {GITHUB.http_cache.summary()}")
     print(f"  Markdown         : {md_file}")
     print(f"  CSV              : {csv_file}")
     if eol_count:
@@ -2,6 +2,7 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "google-cloud-run",
+#     "google-cloud-secret-manager",
 #     "google-auth"
 # ]
 # ///
@@ -9,23 +10,50 @@
 Scan all Cloud Run services and jobs across production GCP projects for environment
 variables referencing the OpenShift Silver cluster (silver.devops.gov.bc.ca).
 
-Supports value-level and key-level ignore patterns. Outputs both a console
-summary and a Markdown report grouped by project.
+Matches can be suppressed by the rules in silver_envvar_ignore.toml (or
+--ignore-rules FILE), scoped by key, value, project and service with
+substring, glob or regex matchers; see ignore_rules.py. --explain lists what
+was suppressed and by which rule. Outputs both a console summary and a
+Markdown report grouped by project.
+
+--envs expands the default products to other environments, keeping only the
+projects that exist in the terraform project configs (gcp/terraform).
+
+Every (project, services|jobs) listing runs on a thread pool, up to
+--concurrency at a time, and results are reported in project order, so a
+full scan takes about as long as the slowest project. With --deep, the
+revision reads and secret reads are fanned out on the same pool.
+
+--deep goes past the service templates: it also reads every revision that is
+currently serving traffic (an older revision can still point at Silver after
+the template was fixed) and resolves env vars backed by Secret Manager
+(value_source.secret_key_ref). Each secret version is read once per run, no
+matter how many services share it, and only the matching host portion of a
+secret is written to the report.
 
 Usage:
     uv run scan_openshift_silver_refs.py
     uv run scan_openshift_silver_refs.py --projects a083gt-prod,c4hnrd-prod
     uv run scan_openshift_silver_refs.py --target gold.devops.gov.bc.ca
+    uv run scan_openshift_silver_refs.py --target .silver.devops.gov.bc.ca,.gold.devops.gov.bc.ca
     uv run scan_openshift_silver_refs.py --output output/my_report.md
+    uv run scan_openshift_silver_refs.py --envs dev,test,prod --concurrency 16
+    uv run scan_openshift_silver_refs.py --deep
+    uv run scan_openshift_silver_refs.py --ignore-rules my_rules.toml --explain
 """
 
 import argparse
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-import google.auth
 from google.cloud import run_v2
 
+import gcp_clients
+from ignore_rules import IgnoreRules
+from patterns import PatternSet, split_targets
+
 # ── Defaults ──────────────────────────────────────────────────────────────────
 DEFAULT_PROJECTS = [
     "a083gt-prod", "bcrbk9-prod", "c4hnrd-prod", "eogruh-prod",
@@ -33,127 +61,411 @@ DEFAULT_PROJECTS = [
     "keee67-prod", "mvnjri-prod", "okagqp-prod"
 ]
 DEFAULT_TARGET = ".silver.devops.gov.bc.ca"
-
-# Env var VALUES containing these strings will be skipped
-IGNORE_VALUE_PATTERNS = ["pay-connector", "namex-solr", "traction-tenant", "minio", "ocp-relay"]
-
-# Env var KEYS matching these will be skipped
-IGNORE_KEY_PATTERNS = ["VALID_REDIRECT_URLS"]
+DEFAULT_CONCURRENCY = 8  # list_services / list_jobs calls in flight
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+# Project inventory (_config_project_*.auto.tfvars); --envs only scans projects listed there
+TF_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "terraform")
+DEFAULT_IGNORE_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "silver_envvar_ignore.toml")
 
+# Hostname characters around a match in a secret payload, for the report excerpt
+SECRET_HOST_CHARS = re.compile(r"[a-z0-9.-]*", re.IGNORECASE)
+# URL scheme (and skipped userinfo) directly in front of that hostname
+SECRET_SCHEME_BEFORE = re.compile(r"\b([a-z][a-z0-9+.-]*://)(?:[^/\s]*@)?\Z", re.IGNORECASE)
 
-def is_ignored_value(value: str) -> bool:
-    return any(p.lower() in value.lower() for p in IGNORE_VALUE_PATTERNS)
 
-
-def is_ignored_key(key: str) -> bool:
-    return any(p.lower() in key.lower() for p in IGNORE_KEY_PATTERNS)
+def terraform_project_ids(tf_dir: str = TF_DIR) -> set[str]:
+    """Every project_id in the terraform project configs, or an empty set if none can be read."""
+    ids: set[str] = set()
+    try:
+        filenames = os.listdir(tf_dir)
+    except OSError:
+        return ids
+    for filename in filenames:
+        if filename.startswith("_config_project_") and filename.endswith(".auto.tfvars"):
+            with open(os.path.join(tf_dir, filename)) as f:
+                ids.update(re.findall(r'project_id\s*=\s*"([^"]+)"', f.read()))
+    return ids
+
+
+def secret_version_name(project_id: str, ref: run_v2.SecretKeySelector) -> str:
+    """Full Secret Manager version name for an env var's secret_key_ref."""
+    secret = ref.secret
+    if not secret.startswith("projects/"):
+        secret = f"projects/{project_id}/secrets/{secret}"
+    return f"{secret}/versions/{ref.version or 'latest'}"
+
+
+def secret_label(version_name: str) -> str:
+    """Short `secret:version` label for a full secret version name."""
+    parts = version_name.split("/")
+    return f"{parts[3]}:{parts[5]}"
+
+
+def secret_excerpt(payload: str, patterns: PatternSet) -> str:
+    """The hostname around the first match in a secret, with its URL scheme and port.
+
+    Secrets often hold whole connection strings or `key=value&...` lists
+    with credentials in them. Nothing but the host, and the scheme and port
+    around it, is copied into the report.
+    """
+    match = patterns.search(payload)
+    start, end = match.start, match.end
+    while start > 0 and SECRET_HOST_CHARS.fullmatch(payload[start - 1]):
+        start -= 1
+    end = SECRET_HOST_CHARS.match(payload, end).end()
+    port = re.match(r":\d+", payload[end:])
+    scheme = SECRET_SCHEME_BEFORE.search(payload, 0, start)
+    return (scheme.group(1) if scheme else "") + payload[start:end] + (port.group() if port else "")
+
+
+def match_env(
+    containers, patterns: PatternSet, rules: IgnoreRules, base: dict, project_id: str, deep: bool
+) -> list[dict]:
+    """Findings for the env vars of `containers`, each starting from a copy of `base`.
+
+    Matches an ignore rule applies to are kept, tagged with "suppressed_by",
+    so --explain can show them. With `deep`, every secret-backed env var
+    becomes a pending finding carrying a "secret" version name; main()
+    resolves those in one batch and drops the ones whose payload doesn't match.
+    """
+    findings = []
+    for container in containers:
+        for env in container.env:
+            if env.value:
+                hits = patterns.hits(env.value)
+                if hits:
+                    finding = {**base, "env_key": env.name, "env_value": env.value, "patterns": hits}
+                    rule = rules.match(project_id, base["name"], env.name, env.value)
+                    if rule:
+                        finding["suppressed_by"] = rule.id
+                    findings.append(finding)
+            elif deep and env.value_source.secret_key_ref.secret:
+                # Don't read secrets a key/project/service rule would suppress anyway
+                if rules.match(project_id, base["name"], env.name):
+                    continue
+                secret = secret_version_name(project_id, env.value_source.secret_key_ref)
+                findings.append({**base, "env_key": env.name, "secret": secret})
+    return findings
 
 
-def scan_services(client: run_v2.ServicesClient, project_id: str, target: str) -> list[dict]:
-    """Scan all Cloud Run services across all regions in a project."""
+def serving_revisions(service: run_v2.Service) -> dict[str, int]:
+    """Revision name → traffic percent for every revision currently serving traffic."""
+    latest = service.latest_ready_revision.split("/")[-1]
+    revisions: dict[str, int] = {}
+    for status in service.traffic_statuses:
+        revision = status.revision or latest
+        if status.percent > 0 and revision:
+            revisions[revision] = revisions.get(revision, 0) + status.percent
+    return revisions
+
+
+def scan_services(
+    client: run_v2.ServicesClient,
+    project_id: str,
+    patterns: PatternSet,
+    rules: IgnoreRules,
+    log: list[str],
+    revisions: list[tuple[str, dict, set]] | None = None,
+) -> list[dict]:
+    """Scan all Cloud Run services across all regions in a project.
+
+    With a `revisions` list (--deep), secret-backed env vars are returned as
+    pending findings, and every revision serving traffic is appended to it as
+    (revision name, finding base, seen keys) for scan_revision. Seen keys are
+    the (key, value or secret) pairs already found in the service template.
+    Warnings are appended to `log` so concurrent scans don't interleave output.
+    """
+    deep = revisions is not None
     findings = []
     parent = f"projects/{project_id}/locations/-"
     try:
         for service in client.list_services(parent=parent):
             svc_name = service.name.split("/")[-1]
             location = service.name.split("/")[3]
-            for container in service.template.containers:
-                for env in container.env:
-                    if not env.value:
-                        continue
-                    if target.lower() in env.value.lower() and not is_ignored_value(env.value) and not is_ignored_key(env.name):
-                        findings.append({
-                            "resource_type": "Service",
-                            "name": svc_name,
-                            "location": location,
-                            "env_key": env.name,
-                            "env_value": env.value,
-                        })
+            base = {"resource_type": "Service", "name": svc_name, "location": location}
+            if deep:
+                base["source"] = "template"
+            service_findings = match_env(service.template.containers, patterns, rules, base, project_id, deep)
+            findings += service_findings
+            if not deep:
+                continue
+
+            seen = {finding_key(f) for f in service_findings}
+            for revision, percent in serving_revisions(service).items():
+                rev_base = {**base, "source": f"revision {revision} ({percent}% traffic)"}
+                revisions.append((f"{service.name}/revisions/{revision}", rev_base, seen))
     except Exception as e:
-        print(f"  ⚠️  Error scanning services in {project_id}: {e}")
+        log.append(f"  ⚠️  Error scanning services in {project_id}: {e}")
     return findings
 
 
-def scan_jobs(client: run_v2.JobsClient, project_id: str, target: str) -> list[dict]:
-    """Scan all Cloud Run jobs across all regions in a project."""
+def finding_key(finding: dict) -> tuple[str, str]:
+    """(env key, value or pending secret) used to de-duplicate revision findings."""
+    return finding["env_key"], finding.get("env_value") or finding["secret"]
+
+
+def scan_revision(
+    client: run_v2.RevisionsClient,
+    name: str,
+    base: dict,
+    project_id: str,
+    patterns: PatternSet,
+    rules: IgnoreRules,
+    log: list[str],
+) -> list[dict]:
+    """Findings for one serving revision, secret-backed env vars pending.
+
+    Errors are appended to `log` and yield no findings.
+    """
+    try:
+        rev = client.get_revision(name=name)
+    except Exception as e:
+        log.append(f"  ⚠️  Error reading revision {name.split('/')[-1]} of {base['name']}: {e}")
+        return []
+    return match_env(rev.containers, patterns, rules, base, project_id, deep=True)
+
+
+def scan_jobs(
+    client: run_v2.JobsClient,
+    project_id: str,
+    patterns: PatternSet,
+    rules: IgnoreRules,
+    log: list[str],
+    deep: bool = False,
+) -> list[dict]:
+    """Scan all Cloud Run jobs across all regions in a project.
+
+    With `deep`, secret-backed env vars are returned as pending findings.
+    Warnings are appended to `log` so concurrent scans don't interleave output.
+    """
     findings = []
     parent = f"projects/{project_id}/locations/-"
     try:
         for job in client.list_jobs(parent=parent):
             job_name = job.name.split("/")[-1]
             location = job.name.split("/")[3]
-            for container in job.template.template.containers:
-                for env in container.env:
-                    if not env.value:
-                        continue
-                    if target.lower() in env.value.lower() and not is_ignored_value(env.value) and not is_ignored_key(env.name):
-                        findings.append({
-                            "resource_type": "Job",
-                            "name": job_name,
-                            "location": location,
-                            "env_key": env.name,
-                            "env_value": env.value,
-                        })
+            base = {"resource_type": "Job", "name": job_name, "location": location}
+            if deep:
+                base["source"] = "template"
+            findings += match_env(job.template.template.containers, patterns, rules, base, project_id, deep)
     except Exception as e:
-        print(f"  ⚠️  Error scanning jobs in {project_id}: {e}")
+        log.append(f"  ⚠️  Error scanning jobs in {project_id}: {e}")
     return findings
 
 
-def main():
+# ── Secret Manager ────────────────────────────────────────────────────────────
+class SecretResolver:
+    """Reads each referenced secret version at most once per run.
+
+    Projects often share a secret across many services, so a batch of version
+    names is de-duplicated before it is fetched concurrently on the caller's
+    pool. Payloads are cached by the requested version name.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.errors: dict[str, str] = {}
+        self._payloads: dict[str, str | None] = {}
+
+    def resolve(self, names: list[str], pool: ThreadPoolExecutor) -> dict[str, str | None]:
+        """Payload (or None if unreadable) for every name in `names`."""
+        missing = [n for n in dict.fromkeys(names) if n not in self._payloads]
+        self._payloads.update(zip(missing, pool.map(self._access, missing)))
+        return {n: self._payloads[n] for n in names}
+
+    def _access(self, name: str) -> str | None:
+        try:
+            response = self.client.access_secret_version(name=name)
+        except Exception as e:
+            self.errors[name] = str(e)
+            return None
+        return response.payload.data.decode("utf-8", errors="replace")
+
+
+def resolve_secret_findings(
+    findings_by_project: dict[str, list[dict]],
+    resolver: SecretResolver,
+    patterns: PatternSet,
+    rules: IgnoreRules,
+    pool: ThreadPoolExecutor,
+):
+    """Replace pending secret findings with real ones, or drop them, in place."""
+    pending = [f for findings in findings_by_project.values() for f in findings if "secret" in f]
+    payloads = resolver.resolve([f["secret"] for f in pending], pool)
+    for project_id, findings in findings_by_project.items():
+        kept = []
+        for f in findings:
+            if "secret" in f:
+                payload = payloads[f["secret"]]
+                hits = patterns.hits(payload) if payload else []
+                if not hits:
+                    continue
+                rule = rules.match(project_id, f["name"], f["env_key"], payload)
+                if rule:
+                    f["suppressed_by"] = rule.id
+                f["env_value"] = secret_excerpt(payload, patterns)
+                f["patterns"] = hits
+                f["source"] = f"{f['source']} → secret {secret_label(f.pop('secret'))}"
+            kept.append(f)
+        findings_by_project[project_id] = kept
+
+
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Scan Cloud Run env vars for OpenShift Silver cluster references")
     parser.add_argument("--projects", help="Comma-separated project IDs (default: all prod projects)")
-    parser.add_argument("--target", default=DEFAULT_TARGET, help="String to search for in env var values")
-    parser.add_argument("--no-filter", action="store_true", help="Disable ignore patterns and show all matches")
+    parser.add_argument(
+        "--envs",
+        default="prod",
+        help="Comma-separated environments of the default projects to scan, e.g. dev,test,prod (default: prod)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Max list_services/list_jobs calls in flight (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        metavar="PATTERN",
+        help=f"String to search for in env var values; repeat or comma-separate for several (default: {DEFAULT_TARGET})",
+    )
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="Also scan revisions serving traffic and resolve Secret Manager-backed env vars",
+    )
+    parser.add_argument(
+        "--ignore-rules",
+        default=DEFAULT_IGNORE_RULES,
+        metavar="FILE",
+        help="TOML file of ignore rules (default: silver_envvar_ignore.toml next to this script)",
+    )
+    parser.add_argument("--no-filter", action="store_true", help="Disable ignore rules and show all matches")
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Also list suppressed matches and the ignore rule that suppressed each",
+    )
     parser.add_argument("--output", help="Output Markdown file (defaults to output/ folder)")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.no_filter:
-        IGNORE_VALUE_PATTERNS.clear()
-        IGNORE_KEY_PATTERNS.clear()
-
-    projects = [p.strip() for p in args.projects.split(",")] if args.projects else DEFAULT_PROJECTS
-    target = args.target
+        rules = IgnoreRules([])
+    else:
+        try:
+            rules = IgnoreRules.load(args.ignore_rules)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot load ignore rules: {e}")
+
+    if args.projects:
+        projects = [p.strip() for p in args.projects.split(",")]
+    else:
+        envs = [e.strip() for e in args.envs.split(",") if e.strip()]
+        projects = [f"{p.rsplit('-', 1)[0]}-{env}" for p in DEFAULT_PROJECTS for env in envs]
+        # Not every product has every environment; don't probe projects that don't exist
+        known = terraform_project_ids()
+        if known:
+            unknown = [p for p in projects if p not in known]
+            projects = [p for p in projects if p in known]
+            if unknown:
+                print(f"  ⏭  Skipping {len(unknown)} project(s) not in the terraform inventory: {', '.join(unknown)}")
+        else:
+            print(f"  ⚠️  No terraform project inventory at {TF_DIR}; scanning every product × env")
+    patterns = PatternSet(split_targets(args.target, DEFAULT_TARGET))
     today = datetime.now().strftime("%Y-%m-%d")
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     output_path = args.output or os.path.join(OUTPUT_DIR, f"silver_envvar_refs_{today}.md")
 
-    credentials, _ = google.auth.default()
-    svc_client = run_v2.ServicesClient(credentials=credentials)
-    job_client = run_v2.JobsClient(credentials=credentials)
+    svc_client = gcp_clients.run_services_client()
+    job_client = gcp_clients.run_jobs_client()
+    revisions_client = gcp_clients.run_revisions_client() if args.deep else None
+    resolver = SecretResolver(gcp_clients.secret_manager_client()) if args.deep else None
 
     print(f"{'=' * 55}")
     print(f"  Cloud Run Environment Variable Scanner")
     print(f"{'=' * 55}")
-    print(f"  Search String : {target}")
+    print(f"  Search String : {patterns}")
     print(f"  Projects      : {len(projects)}")
+    print(f"  Mode          : {'deep (serving revisions + secrets)' if args.deep else 'templates'}")
+    print(f"  Ignore Rules  : {'none (--no-filter)' if args.no_filter else f'{len(rules)} from {args.ignore_rules}'}")
     print(f"{'=' * 55}\n")
 
     all_findings: dict[str, list[dict]] = {}
 
+    # Fan out every project × resource type, then report in project order
+    print(f"  Scanning Cloud Run services and jobs ({max(1, args.concurrency)} calls at a time)...\n")
+    logs = {project_id: ([], []) for project_id in projects}
+    revisions = {project_id: [] for project_id in projects} if args.deep else {}
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        service_futures = {
+            p: pool.submit(scan_services, svc_client, p, patterns, rules, logs[p][0], revisions.get(p))
+            for p in projects
+        }
+        job_futures = {
+            p: pool.submit(scan_jobs, job_client, p, patterns, rules, logs[p][1], args.deep) for p in projects
+        }
+        findings_by_project = {p: service_futures[p].result() + job_futures[p].result() for p in projects}
+
+        # Read every serving revision at once; only report what one adds on
+        # top of its service template (or an earlier revision)
+        revision_futures = {
+            p: [
+                (seen, pool.submit(scan_revision, revisions_client, name, base, p, patterns, rules, logs[p][0]))
+                for name, base, seen in revisions[p]
+            ]
+            for p in revisions
+        }
+        for p, futures in revision_futures.items():
+            for seen, future in futures:
+                for f in future.result():
+                    if finding_key(f) not in seen:
+                        seen.add(finding_key(f))
+                        findings_by_project[p].append(f)
+
+        if resolver:
+            resolve_secret_findings(findings_by_project, resolver, patterns, rules, pool)
+
+    suppressed = {
+        p: [f for f in findings if "suppressed_by" in f] for p, findings in findings_by_project.items()
+    }
+    findings_by_project = {
+        p: [f for f in findings if "suppressed_by" not in f] for p, findings in findings_by_project.items()
+    }
+
+    if resolver and resolver.errors:
+        print(f"  ⚠️  Could not read {len(resolver.errors)} secret version(s):")
+        for name, error in sorted(resolver.errors.items()):
+            print(f"        {name}: {error}")
+        print()
+
     for project_id in projects:
         print(f"{'━' * 47}")
         print(f"Project: {project_id}")
         print(f"{'━' * 47}")
+        for line in logs[project_id][0] + logs[project_id][1]:
+            print(line)
 
-        print("  Scanning Cloud Run services...")
-        service_findings = scan_services(svc_client, project_id, target)
-
-        print("  Scanning Cloud Run jobs...")
-        job_findings = scan_jobs(job_client, project_id, target)
-
-        findings = service_findings + job_findings
+        findings = findings_by_project[project_id]
         if findings:
             all_findings[project_id] = findings
             for f in findings:
                 print(f"  ⚠️  {f['resource_type']}: {f['name']} ({f['location']})")
                 print(f"        ENV VAR : {f['env_key']}")
-                print(f"        VALUE   : {f['env_value']}\n")
+                print(f"        VALUE   : {f['env_value']}")
+                if args.deep:
+                    print(f"        SOURCE  : {f['source']}")
+                print(f"        PATTERN : {', '.join(f['patterns'])}\n")
         else:
             print("  ✅ No matches found.\n")
 
+        if args.explain:
+            for f in suppressed[project_id]:
+                print(f"  🔇 {f['resource_type']}: {f['name']} ({f['location']}) — suppressed by {f['suppressed_by']}")
+                print(f"        {f['env_key']} = {f['env_value']}\n")
+
     total_matches = sum(len(v) for v in all_findings.values())
 
     # ── Console summary ───────────────────────────────────────────────────────
@@ -166,24 +478,34 @@ def main():
                 print(f"[{project_id}] {f['resource_type']}: {f['name']} ({f['location']})")
                 print(f"  └─ {f['env_key']} = {f['env_value']}")
 
+    if args.explain:
+        per_rule = {rule.id: 0 for rule in rules.rules}
+        for findings in suppressed.values():
+            for f in findings:
+                per_rule[f["suppressed_by"]] += 1
+        print(f"\n  Suppressed by ignore rules ({sum(per_rule.values())}):")
+        for rule_id, count in per_rule.items():
+            print(f"    {rule_id:<30} {count}")
+
     # ── Write Markdown ────────────────────────────────────────────────────────
     md_lines = [
-        f"# Cloud Run Env Var Scan: `{target}`",
+        f"# Cloud Run Env Var Scan: {', '.join(f'`{p}`' for p in patterns.patterns)}",
         "",
         f"**Scan Date:** {today}  ",
         f"**Projects Scanned:** {len(projects)} | **Total Matches:** {total_matches}",
         "",
         "---",
         "",
-        "| Project | Type | Name | Location | Env Key | Env Value |",
-        "|:---|:---|:---|:---|:---|:---|",
+        "| Project | Type | Name | Location | Env Key | Env Value | Pattern |" + (" Source |" if args.deep else ""),
+        "|:---|:---|:---|:---|:---|:---|:---|" + (":---|" if args.deep else ""),
     ]
 
     for project_id in projects:
         for f in all_findings.get(project_id, []):
             md_lines.append(
                 f"| {project_id} | {f['resource_type']} | {f['name']} | {f['location']} "
-                f"| `{f['env_key']}` | `{f['env_value']}` |"
+                f"| `{f['env_key']}` | `{f['env_value']}` | {', '.join(f['patterns'])} |"
+                + (f" {f['source']} |" if args.deep else "")
             )
 
     md_lines += ["", "---", ""]
@@ -212,6 +534,22 @@ def main():
                 md_lines.append(f"| {f['name']} | {f['location']} | `{f['env_key']}` | `{f['env_value']}` |")
             md_lines.append("")
 
+    if args.explain:
+        md_lines += [
+            "---",
+            "",
+            "## Suppressed Matches\n",
+            "| Project | Type | Name | Location | Env Key | Env Value | Rule |",
+            "|:---|:---|:---|:---|:---|:---|:---|",
+        ]
+        for project_id in projects:
+            for f in suppressed[project_id]:
+                md_lines.append(
+                    f"| {project_id} | {f['resource_type']} | {f['name']} | {f['location']} "
+                    f"| `{f['env_key']}` | `{f['env_value']}` | {f['suppressed_by']} |"
+                )
+        md_lines.append("")
+
     with open(output_path, "w") as out_file:
         out_file.write("\n".join(md_lines))
 
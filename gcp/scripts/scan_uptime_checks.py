@@ -19,9 +19,10 @@ import argparse
 import os
 from datetime import datetime
 
-import google.auth
 from google.cloud import monitoring_v3
 
+import gcp_clients
+
 DEFAULT_PROJECTS = [
     "a083gt-prod", "bcrbk9-prod", "c4hnrd-prod", "eogruh-prod",
     "gtksf3-prod", "yfjq17-prod", "yfthig-prod", "k973yf-prod",
@@ -83,11 +84,11 @@ def get_uptime_checks(client: monitoring_v3.UptimeCheckServiceClient, project_id
     return checks
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="List all GCP Uptime Checks across prod projects")
     parser.add_argument("--projects", help="Comma-separated project IDs (default: all prod projects)")
     parser.add_argument("--output", help="Output Markdown file (defaults to output/ folder)")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     projects = [p.strip() for p in args.projects.split(",")] if args.projects else DEFAULT_PROJECTS
     today = datetime.now().strftime("%Y-%m-%d")
@@ -95,8 +96,7 @@ def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     output_path = args.output or os.path.join(OUTPUT_DIR, f"uptime_checks_{today}.md")
 
-    credentials, _ = google.auth.default()
-    client = monitoring_v3.UptimeCheckServiceClient(credentials=credentials)
+    client = gcp_clients.uptime_check_client()
 
     print(f"{'=' * 60}")
     print(f"  GCP Uptime Check Scanner")
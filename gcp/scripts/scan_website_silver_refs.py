@@ -1,7 +1,7 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "httpx",
+#     "httpx[http2]",
 #     "beautifulsoup4"
 # ]
 # ///
@@ -13,22 +13,57 @@ or inline JavaScript at build time (via window.__NUXT__, process.env injection,
 or <script> config blocks). This script fetches each site's HTML and referenced
 JS bundles, then searches for Silver cluster URL patterns.
 
+Sites and their bundles are fetched concurrently over HTTP/2 with an asyncio
+crawler, bounded by a global limit and a per-host limit (several sites share
+the same hosting/CDN), so a full scan takes about as long as the slowest site.
+
+Many sites load the same bundles, so each bundle URL is downloaded once per
+run and its findings, stored once per distinct body (by SHA-256), are
+reported under every site that includes it. The bundle index
+(URL → ETag, content hash) and per-hash findings are kept under
+output/.cache/state/, so on the next run unchanged bundles are revalidated
+with If-None-Match and their findings reused without downloading them again.
+
+Bundles are streamed rather than loaded whole: the scanner works on a
+sliding window of decoded text, and downloads stop as soon as Content-Length
+or the bytes received exceed the size cap, so memory stays flat however
+large a bundle is.
+
+Nuxt 3 / Vite apps load most route code through dynamic `import()` calls
+rather than <script>/<link> tags, so scanned bundles are also mined for
+chunk references (import specifiers, `_nuxt/` paths in preload dependency
+maps, and Nuxt's builds/meta/<id>.json manifest). New same-origin chunks are
+crawled breadth-first, bounded by --chunk-depth and a per-site
+--chunk-budget of bundle bytes.
+
 Usage:
     uv run scan_website_silver_refs.py
     uv run scan_website_silver_refs.py --target gold.devops.gov.bc.ca
+    uv run scan_website_silver_refs.py --target silver.devops.gov.bc.ca --target gold.devops.gov.bc.ca,pay-connector
     uv run scan_website_silver_refs.py --urls https://www.bcregistry.gov.bc.ca,https://account.bcregistry.gov.bc.ca
     uv run scan_website_silver_refs.py --output output/website_silver_refs.md
+    uv run scan_website_silver_refs.py --concurrency 32 --per-host 8
+    uv run scan_website_silver_refs.py --no-cache
+    uv run scan_website_silver_refs.py --chunk-depth 5 --chunk-budget 100
 """
 
 import argparse
+import asyncio
+import codecs
+import hashlib
+import json
 import os
 import re
+from contextlib import asynccontextmanager
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 
 import httpx
 from bs4 import BeautifulSoup
 
+from patterns import PatternSet, split_targets
+from state import StateStore
+
 # ── Known BC Registry public websites ─────────────────────────────────────────
 DEFAULT_WEBSITES = [
     "https://www.bcregistry.gov.bc.ca",
@@ -58,15 +93,34 @@ DEFAULT_WEBSITES = [
 
 DEFAULT_TARGET = "silver.devops.gov.bc.ca"
 
-# Extract URL-like strings containing the target from JS/HTML
-URL_EXTRACT_PATTERN = re.compile(r'["\`](https?://[^\s"\'`<>]{5,})["\`]', re.IGNORECASE)
+MAX_URL_LENGTH = 2048  # Longest embedded URL matched; bounds the streaming overlap
+CONTEXT_WINDOW = 120  # Characters of context kept on each side of a match
+
+# Extract URL-like strings containing a target from JS/HTML
+URL_EXTRACT_PATTERN = re.compile(
+    r'["\`](https?://[^\s"\'`<>]{5,%d})["\`]' % MAX_URL_LENGTH, re.IGNORECASE
+)
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
 MAX_JS_BUNDLES = 20  # Max JS files to fetch per page (avoid fetching everything)
 MAX_JS_SIZE = 10_000_000  # Skip JS files larger than 10MB
-
-
-def extract_context(text: str, match_start: int, window: int = 120) -> str:
+STREAM_CHUNK_SIZE = 64 * 1024  # Bytes read per chunk when streaming a bundle
+DEFAULT_CHUNK_DEPTH = 3  # Import hops followed from the page's own bundles
+DEFAULT_CHUNK_BUDGET_MB = 50  # Max JS bytes scanned per site, page bundles included
+
+# Chunk references in built JS: import("./x.js"), import "./x.js", from "./x.js",
+# and build-relative paths such as "_nuxt/x.js" in Vite's preload dependency maps
+CHUNK_REF_PATTERN = re.compile(
+    r"""(?:\bimport\s*\(\s*|\bfrom\s*|\bimport\s*)["'`]([^"'`\s${}]{1,512}?\.m?js)["'`]"""
+    r"""|["'`]((?:\.{0,2}/)?[\w@.~/-]{0,256}_nuxt/[\w@.~/-]{1,256}?\.m?js)["'`]"""
+)
+CHUNK_REF_TAIL = 1100  # Longer than any CHUNK_REF_PATTERN match
+DEFAULT_CONCURRENCY = 16  # Max requests in flight across all sites
+DEFAULT_PER_HOST = 4  # Max requests in flight to any one host
+BUNDLE_STATE_VERSION = 3  # Bump when the stored bundle index/findings change shape
+
+
+def extract_context(text: str, match_start: int, window: int = CONTEXT_WINDOW) -> str:
     """Return a snippet of text around a match position."""
     start = max(0, match_start - window)
     end = min(len(text), match_start + window)
@@ -74,77 +128,356 @@ def extract_context(text: str, match_start: int, window: int = 120) -> str:
     return snippet.strip()
 
 
-def scan_text(content: str, target: str, source_url: str) -> list[dict]:
-    """Find all occurrences of target in content, with surrounding context."""
-    findings = []
-    seen_urls = set()
-
-    # Find embedded URLs matching the target
-    for m in URL_EXTRACT_PATTERN.finditer(content):
-        url = m.group(1)
-        if target.lower() in url.lower() and url not in seen_urls:
-            seen_urls.add(url)
-            context = extract_context(content, m.start())
-            findings.append(
-                {
-                    "source": source_url,
+class StreamScanner:
+    """Find occurrences of any target pattern in text that arrives in chunks.
+
+    Only a sliding window is held: text not yet scanned plus an overlap long
+    enough that a URL or context snippet straddling a chunk boundary is seen
+    whole. Matches starting inside the overlap are left for the next chunk
+    (or `finish`). Patterns are compiled case-insensitive, so no lowered
+    copies of the text are made.
+
+    Findings come out exactly as a single pass over the whole text would
+    produce them: embedded quoted URLs first, then raw occurrences. Each is
+    tagged with the patterns it matched.
+    """
+
+    def __init__(self, patterns: PatternSet, source_url: str):
+        self.patterns = patterns
+        self.source_url = source_url
+        self._url_in_ctx = {
+            p: re.compile(r"https?://\S+" + re.escape(p) + r"\S*", re.IGNORECASE)
+            for p in patterns.patterns
+        }
+        self._overlap = max(MAX_URL_LENGTH + 2, patterns.max_length) + CONTEXT_WINDOW
+        self._buf = ""
+        self._offset = 0  # absolute position of _buf[0]
+        self._pos = 0  # matches starting before this have been handled
+        self._url_end = 0  # end of the last URL match (finditer never overlaps)
+        self._url_findings: dict[str, dict] = {}
+        # First context and the patterns seen per raw URL, in order
+        self._raw_findings: dict[str, tuple[str, list[str]]] = {}
+
+    def feed(self, chunk: str):
+        self._buf += chunk
+        self._scan(final=False)
+
+    def finish(self) -> list[dict]:
+        """Scan what's left of the window and return all findings."""
+        self._scan(final=True)
+        findings = self._url_findings
+        for found_url, (ctx, patterns) in self._raw_findings.items():
+            if found_url in findings:
+                continue
+            findings[found_url] = {
+                "source": self.source_url,
+                "matched_url": found_url,
+                "context": ctx,
+                "patterns": patterns,
+            }
+        return list(findings.values())
+
+    def _scan(self, final: bool):
+        buf, offset = self._buf, self._offset
+        limit = len(buf) if final else len(buf) - self._overlap
+        if limit <= self._pos - offset:
+            return
+
+        # Find embedded URLs matching a target
+        for m in URL_EXTRACT_PATTERN.finditer(buf, max(self._pos, self._url_end) - offset):
+            if m.start() >= limit:
+                break
+            self._url_end = offset + m.end()
+            url = m.group(1)
+            if url in self._url_findings:
+                continue
+            patterns = self.patterns.hits(url)
+            if patterns:
+                self._url_findings[url] = {
+                    "source": self.source_url,
                     "matched_url": url,
-                    "context": context,
+                    "context": extract_context(buf, m.start()),
+                    "patterns": patterns,
                 }
-            )
 
-    # Also catch raw non-quoted occurrences (e.g. template literals, concatenations)
-    for m in re.finditer(re.escape(target), content, re.IGNORECASE):
-        ctx = extract_context(content, m.start())
-        # Try to extract the full URL from the context
-        url_in_ctx = re.search(
-            r"https?://\S+" + re.escape(target) + r"\S*", ctx, re.IGNORECASE
-        )
-        found_url = (
-            url_in_ctx.group(0).rstrip("\",;`'")
-            if url_in_ctx
-            else f"...(contains {target})..."
-        )
-        if found_url not in seen_urls:
-            seen_urls.add(found_url)
-            findings.append(
-                {
-                    "source": source_url,
-                    "matched_url": found_url,
-                    "context": ctx,
-                }
+        # Also catch raw non-quoted occurrences (e.g. template literals, concatenations)
+        for m in self.patterns.finditer(buf, self._pos - offset):
+            if m.start >= limit:
+                break
+            ctx = extract_context(buf, m.start)
+            # Try to extract the full URL from the context
+            url_in_ctx = self._url_in_ctx[m.pattern].search(ctx)
+            found_url = (
+                url_in_ctx.group(0).rstrip("\",;`'")
+                if url_in_ctx
+                else f"...(contains {m.pattern})..."
             )
+            ctx, patterns = self._raw_findings.setdefault(found_url, (ctx, []))
+            if m.pattern not in patterns:
+                patterns.append(m.pattern)
+
+        # Keep enough text before the new position for the next matches' context
+        self._pos = offset + limit
+        keep = max(0, limit - CONTEXT_WINDOW)
+        self._buf = buf[keep:]
+        self._offset = offset + keep
+
+
+def scan_text(content: str, patterns: PatternSet, source_url: str) -> list[dict]:
+    """Find all occurrences of the target patterns in content, with surrounding context."""
+    scanner = StreamScanner(patterns, source_url)
+    scanner.feed(content)
+    return scanner.finish()
+
+
+class ChunkRefCollector:
+    """Collect chunk specifiers from JS that arrives in chunks, in first-seen order.
+
+    A tail of the previous chunk is rescanned with the next one so a
+    reference split across the boundary is still seen whole; references
+    found twice are deduplicated.
+    """
+
+    def __init__(self):
+        self.specifiers: dict[str, None] = {}
+        self._tail = ""
+
+    def feed(self, chunk: str):
+        buf = self._tail + chunk
+        for m in CHUNK_REF_PATTERN.finditer(buf):
+            self.specifiers.setdefault(m.group(1) or m.group(2), None)
+        self._tail = buf[-CHUNK_REF_TAIL:]
+
+
+def resolve_chunk(specifier: str, importer: str) -> str:
+    """Resolve a chunk specifier found in `importer` (a bundle or manifest URL).
+
+    Relative and absolute specifiers resolve as the browser would. Bare
+    build-relative paths ("_nuxt/x.js") are relative to the app base, i.e.
+    the part of the importer's URL before its own "/_nuxt/" segment.
+    """
+    if specifier.startswith(("./", "../", "/")) or "://" in specifier:
+        return urljoin(importer, specifier)
+    head, sep, _ = importer.partition("/" + specifier.split("/")[0] + "/")
+    return urljoin(head + "/", specifier) if sep else urljoin(importer, specifier)
+
+
+def same_origin(a: str, b: str) -> bool:
+    pa, pb = urlparse(a), urlparse(b)
+    return (pa.scheme, pa.netloc) == (pb.scheme, pb.netloc)
+
+
+class Fetcher:
+    """Async HTTP fetcher with a global and a per-host concurrency limit."""
+
+    def __init__(self, client: httpx.AsyncClient, max_concurrency: int, per_host: int):
+        self.client = client
+        self.per_host = per_host
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def fetch(self, url: str, log: list[str]) -> str | None:
+        """Fetch URL content, returning text or None on failure."""
+        try:
+            async with self._host_slot(url), self._global:
+                resp = await self.client.get(url, follow_redirects=True, timeout=15)
+            if resp.status_code == 200:
+                return resp.text
+        except Exception as e:
+            log.append(f"  ⚠️  Could not fetch {url}: {e}")
+        return None
+
+    @asynccontextmanager
+    async def stream(self, url: str, headers: dict | None = None):
+        """Open a streaming GET, holding the concurrency slots until the body is read."""
+        async with self._host_slot(url), self._global:
+            async with self.client.stream(
+                "GET", url, headers=headers, follow_redirects=True, timeout=15
+            ) as resp:
+                yield resp
+
+
+class BundleCache:
+    """Content-addressed JS bundle scan results shared by all sites in a run.
+
+    Each bundle URL is fetched and scanned at most once per run (concurrent
+    sites await the same task). Bodies are streamed through a
+    `StreamScanner` and a `ChunkRefCollector` and hashed on the fly.
+    Findings and chunk references are stored once per distinct body, keyed
+    by its SHA-256; findings carry no source so the caller can attribute
+    them to every site that includes the bundle. Bundles over MAX_JS_SIZE
+    are abandoned as soon as that is known.
+
+    With a `store`, the URL → {etag, sha256, size} index and the per-hash
+    results survive between runs: a bundle whose stored findings are still
+    valid is requested with If-None-Match and a 304 reuses them as-is.
+    """
+
+    def __init__(self, fetcher: Fetcher, patterns: PatternSet, store: StateStore | None = None):
+        self.fetcher = fetcher
+        self.patterns = patterns
+        self.store = store
+        state = store.load() if store else {}
+        self.urls: dict[str, dict] = state.get("urls", {})
+        # {sha256: {"imports": [specifier, ...], "findings": {pattern set key: [finding, ...]}}}
+        self.results: dict[str, dict] = state.get("results", {})
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.stats = {"fetched": 0, "not_modified": 0, "reused": 0, "scanned": 0}
+
+    def scan(self, url: str, log: list[str]) -> asyncio.Task:
+        """Return a task resolving to {"size", "findings", "imports"} for `url`, or None if it can't be fetched.
+
+        `findings` is None (and `imports` empty) when the bundle is too large to scan.
+        """
+        task = self._tasks.get(url)
+        if task is None:
+            task = self._tasks[url] = asyncio.ensure_future(self._scan(url, log))
+        else:
+            self.stats["reused"] += 1
+        return task
+
+    def _stored(self, entry: dict | None) -> dict | None:
+        if not entry or entry["sha256"] not in self.results:
+            return None
+        result = self.results[entry["sha256"]]
+        findings = result["findings"].get(self.patterns.key)
+        if findings is None:
+            return None
+        return {"size": entry["size"], "findings": findings, "imports": result["imports"]}
+
+    async def _scan(self, url: str, log: list[str]) -> dict | None:
+        entry = self.urls.get(url)
+        stored = self._stored(entry)
+        headers = {"If-None-Match": entry["etag"]} if stored is not None and entry.get("etag") else None
+
+        try:
+            async with self.fetcher.stream(url, headers=headers) as resp:
+                if resp.status_code == 304 and stored is not None:
+                    self.stats["not_modified"] += 1
+                    return stored
+                if resp.status_code != 200:
+                    return None
+                self.stats["fetched"] += 1
+                return await self._read(url, resp)
+        except Exception as e:
+            log.append(f"  ⚠️  Could not fetch {url}: {e}")
+            return None
+
+    async def _read(self, url: str, resp: httpx.Response) -> dict:
+        """Stream, hash and scan a 200 response body, stopping at MAX_JS_SIZE."""
+        declared = int(resp.headers.get("content-length") or 0)
+        if declared > MAX_JS_SIZE:
+            return {"size": declared, "findings": None, "imports": []}
+
+        digest = hashlib.sha256()
+        scanner = StreamScanner(self.patterns, url)
+        refs = ChunkRefCollector()
+        decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+        size = 0
+        async for chunk in resp.aiter_bytes(STREAM_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_JS_SIZE:
+                return {"size": size, "findings": None, "imports": []}
+            digest.update(chunk)
+            text = decoder.decode(chunk)
+            scanner.feed(text)
+            refs.feed(text)
+        text = decoder.decode(b"", final=True)
+        scanner.feed(text)
+        refs.feed(text)
+        self.stats["scanned"] += 1
+
+        sha256 = digest.hexdigest()
+        self.urls[url] = {"etag": resp.headers.get("etag"), "sha256": sha256, "size": size}
+        result = self.results.setdefault(sha256, {"imports": list(refs.specifiers), "findings": {}})
+        result["findings"].setdefault(
+            self.patterns.key,
+            [{k: v for k, v in f.items() if k != "source"} for f in scanner.finish()],
+        )
+        entry = self.urls[url]
+        return self._stored(entry)
+
+    def save(self):
+        """Persist the index for bundles seen this run, dropping unreferenced results."""
+        if self.store is None:
+            return
+        urls = {u: self.urls[u] for u in self._tasks if u in self.urls}
+        digests = {e["sha256"] for e in urls.values()}
+        results = {d: r for d, r in self.results.items() if d in digests}
+        self.store.save({"urls": urls, "results": results})
+
+
+async def fetch_build_manifest_chunks(fetcher: Fetcher, js_urls: list[str], log: list[str]) -> list[str]:
+    """Chunk URLs named in Nuxt's build manifest for each `_nuxt/` asset dir in `js_urls`.
+
+    Nuxt 3 publishes builds/latest.json ({"id": ...}) and builds/meta/<id>.json
+    next to its chunks; every .js path found anywhere in the meta document is
+    returned, resolved against the asset dir.
+    """
+    asset_dirs = dict.fromkeys(
+        u[: u.index("/_nuxt/") + len("/_nuxt/")] for u in js_urls if "/_nuxt/" in u
+    )
+    chunks = []
+    for base in asset_dirs:
+        try:
+            build_id = json.loads(await fetcher.fetch(urljoin(base, "builds/latest.json"), log) or "{}").get("id")
+            meta_url = urljoin(base, f"builds/meta/{build_id}.json")
+            meta = json.loads(await fetcher.fetch(meta_url, log) or "null") if build_id else None
+        except (ValueError, AttributeError):
+            continue
 
-    return findings
-
-
-def fetch(client: httpx.Client, url: str) -> str | None:
-    """Fetch URL content, returning text or None on failure."""
-    try:
-        resp = client.get(url, follow_redirects=True, timeout=15)
-        if resp.status_code == 200:
-            return resp.text
-    except Exception as e:
-        print(f"  ⚠️  Could not fetch {url}: {e}")
-    return None
-
-
-def scan_website(client: httpx.Client, base_url: str, target: str) -> list[dict]:
-    """Fetch a website's HTML and key JS bundles, scanning for Silver references."""
+        stack = [meta]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                stack += node.values()
+            elif isinstance(node, list):
+                stack += node
+            elif isinstance(node, str) and re.fullmatch(r"[\w@.~/-]+\.m?js", node):
+                chunks.append(resolve_chunk(node, base))
+    return chunks
+
+
+async def scan_website(
+    fetcher: Fetcher,
+    bundles: BundleCache,
+    base_url: str,
+    patterns: PatternSet,
+    log: list[str],
+    chunk_depth: int = DEFAULT_CHUNK_DEPTH,
+    chunk_budget: int = DEFAULT_CHUNK_BUDGET_MB * 1024 * 1024,
+) -> list[dict]:
+    """Fetch a website's HTML and key JS bundles, scanning for Silver references.
+
+    After the page's own bundles, chunks they import (plus any in Nuxt's
+    build manifest) are crawled breadth-first up to `chunk_depth` hops,
+    same-origin only, until `chunk_budget` bytes of JS have been scanned for
+    this site. The budget is checked between waves, so it can be exceeded
+    by at most one wave.
+
+    Progress messages are appended to `log` so concurrent sites don't
+    interleave their output.
+    """
     findings = []
     parsed = urlparse(base_url)
     origin = f"{parsed.scheme}://{parsed.netloc}"
 
-    print(f"\n  Fetching: {base_url}")
-    html = fetch(client, base_url)
+    log.append(f"\n  Fetching: {base_url}")
+    html = await fetcher.fetch(base_url, log)
     if not html:
-        print(f"  ⚠️  Failed to fetch page HTML.")
+        log.append(f"  ⚠️  Failed to fetch page HTML.")
         return findings
 
     # Scan HTML directly
-    html_findings = scan_text(html, target, f"{base_url} [HTML]")
+    html_findings = scan_text(html, patterns, f"{base_url} [HTML]")
     if html_findings:
-        print(f"  Found {len(html_findings)} match(es) in page HTML.")
+        log.append(f"  Found {len(html_findings)} match(es) in page HTML.")
         findings.extend(html_findings)
 
     # Parse JS script tags
@@ -161,14 +494,12 @@ def scan_website(client: httpx.Client, base_url: str, target: str) -> list[dict]
 
     # Also scan inline scripts for nuxt/vue config injection
     for tag in soup.find_all("script", src=False):
-        inline = tag.get_text()
-        if target.lower() in inline.lower():
-            inline_findings = scan_text(inline, target, f"{base_url} [inline script]")
-            findings.extend(inline_findings)
-            if inline_findings:
-                print(
-                    f"  Found {len(inline_findings)} match(es) in inline <script> block."
-                )
+        inline_findings = scan_text(tag.get_text(), patterns, f"{base_url} [inline script]")
+        findings.extend(inline_findings)
+        if inline_findings:
+            log.append(
+                f"  Found {len(inline_findings)} match(es) in inline <script> block."
+            )
 
     # Also collect _nuxt/ and assets/ JS from <link rel="preload"> tags
     preload_links = soup.find_all("link", rel=lambda r: r and "preload" in r)
@@ -179,31 +510,111 @@ def scan_website(client: httpx.Client, base_url: str, target: str) -> list[dict]
             if full_url not in js_urls:
                 js_urls.append(full_url)
 
-    # Fetch and scan JS bundles (limit to avoid downloading the whole app)
+    # Fetch and scan JS bundles (limit to avoid downloading the whole app).
+    # Bundles download in parallel waves sized to the bundles still needed,
+    # so failed or oversized ones are replaced from the next candidates
+    # without fetching more than a sequential scan would.
+    seen = set(js_urls)
+    next_level: list[str] = []  # chunks discovered for the next crawl depth
+    scanned_bytes = 0
+
+    def record(js_url: str, result: dict | None) -> bool:
+        """Collect a bundle's findings and new chunk refs; True if it was scanned."""
+        nonlocal scanned_bytes
+        if not result or not result["size"]:
+            return False
+
+        if result["findings"] is None:
+            log.append(f"  ⏭  Skipping large bundle: {js_url} ({result['size'] // 1024}KB)")
+            return False
+
+        scanned_bytes += result["size"]
+        if result["findings"]:
+            log.append(f"  Found {len(result['findings'])} match(es) in {js_url}")
+            findings.extend({"source": js_url, **f} for f in result["findings"])
+        for specifier in result["imports"]:
+            chunk_url = resolve_chunk(specifier, js_url)
+            if chunk_url not in seen and same_origin(chunk_url, js_url):
+                seen.add(chunk_url)
+                next_level.append(chunk_url)
+        return True
+
+    candidates = js_urls[: MAX_JS_BUNDLES * 3]  # try more, skip large ones
     scanned_js = 0
-    for js_url in js_urls[: MAX_JS_BUNDLES * 3]:  # try more, skip large ones
-        if scanned_js >= MAX_JS_BUNDLES:
-            break
-
-        js_content = fetch(client, js_url)
-        if not js_content:
-            continue
+    while candidates and scanned_js < MAX_JS_BUNDLES:
+        wave = candidates[: MAX_JS_BUNDLES - scanned_js]
+        candidates = candidates[len(wave) :]
+        scanned = await asyncio.gather(*(bundles.scan(u, log) for u in wave))
+        scanned_js += sum(record(u, r) for u, r in zip(wave, scanned))
 
-        if len(js_content) > MAX_JS_SIZE:
-            print(f"  ⏭  Skipping large bundle: {js_url} ({len(js_content) // 1024}KB)")
-            continue
+    if chunk_depth <= 0:
+        return findings
 
-        scanned_js += 1
-        if target.lower() in js_content.lower():
-            js_findings = scan_text(js_content, target, js_url)
-            if js_findings:
-                print(f"  Found {len(js_findings)} match(es) in {js_url}")
-                findings.extend(js_findings)
+    # Crawl dynamically imported chunks breadth-first within the depth and byte budgets
+    for chunk_url in await fetch_build_manifest_chunks(fetcher, js_urls, log):
+        if chunk_url not in seen and same_origin(chunk_url, origin):
+            seen.add(chunk_url)
+            next_level.append(chunk_url)
+
+    crawled = 0
+    depth = 0
+    while next_level and depth < chunk_depth and scanned_bytes < chunk_budget:
+        depth += 1
+        level, next_level = next_level, []
+        while level and scanned_bytes < chunk_budget:
+            wave, level = level[:MAX_JS_BUNDLES], level[MAX_JS_BUNDLES:]
+            scanned = await asyncio.gather(*(bundles.scan(u, log) for u in wave))
+            crawled += sum(record(u, r) for u, r in zip(wave, scanned))
+        next_level = level + next_level
+
+    if crawled or next_level:
+        stop = ""
+        if next_level:
+            reason = "byte budget" if scanned_bytes >= chunk_budget else "depth limit"
+            stop = f"; {len(next_level)} left at {reason}"
+        log.append(
+            f"  🧩 Crawled {crawled} imported chunk(s) over {depth} level(s), "
+            f"{scanned_bytes // 1024}KB of JS scanned{stop}."
+        )
 
     return findings
 
 
-def main():
+async def scan_websites(
+    websites: list[str],
+    patterns: PatternSet,
+    headers: dict,
+    concurrency: int,
+    per_host: int,
+    store: StateStore | None = None,
+    chunk_depth: int = DEFAULT_CHUNK_DEPTH,
+    chunk_budget: int = DEFAULT_CHUNK_BUDGET_MB * 1024 * 1024,
+) -> tuple[dict[str, list[dict]], dict[str, int]]:
+    """Scan all sites concurrently.
+
+    Returns ({site: findings} in `websites` order, bundle cache stats).
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(headers=headers, timeout=20, http2=True, limits=limits) as client:
+        fetcher = Fetcher(client, concurrency, per_host)
+        bundles = BundleCache(fetcher, patterns, store)
+
+        async def scan_one(url: str) -> tuple[str, list[dict]]:
+            log: list[str] = []
+            findings = await scan_website(
+                fetcher, bundles, url, patterns, log, chunk_depth, chunk_budget
+            )
+            if not findings:
+                log.append(f"  ✅ No Silver references found.")
+            print("\n".join(log))
+            return url, findings
+
+        results = dict(await asyncio.gather(*(scan_one(url) for url in websites)))
+    bundles.save()
+    return {url: results[url] for url in websites}, bundles.stats
+
+
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(
         description="Scan BC Registry websites for embedded Silver cluster URLs"
     )
@@ -211,16 +622,51 @@ def main():
         "--urls",
         help="Comma-separated list of website URLs to scan (uses defaults if omitted)",
     )
-    parser.add_argument("--target", default=DEFAULT_TARGET, help="String to search for")
+    parser.add_argument(
+        "--target",
+        action="append",
+        metavar="PATTERN",
+        help=f"String to search for; repeat or comma-separate for several (default: {DEFAULT_TARGET})",
+    )
     parser.add_argument(
         "--output", help="Output Markdown file path (defaults to output/ folder)"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Max requests in flight across all sites (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f"Max requests in flight per host (default: {DEFAULT_PER_HOST})",
+    )
+    parser.add_argument(
+        "--chunk-depth",
+        type=int,
+        default=DEFAULT_CHUNK_DEPTH,
+        help=f"Import hops to follow from each page's bundles; 0 disables chunk discovery (default: {DEFAULT_CHUNK_DEPTH})",
+    )
+    parser.add_argument(
+        "--chunk-budget",
+        type=int,
+        default=DEFAULT_CHUNK_BUDGET_MB,
+        metavar="MB",
+        help=f"Stop crawling chunks once a site's scanned JS reaches this size (default: {DEFAULT_CHUNK_BUDGET_MB})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Download and scan every bundle; don't read or update the bundle cache",
+    )
+    args = parser.parse_args(argv)
 
     websites = (
         [u.strip() for u in args.urls.split(",")] if args.urls else DEFAULT_WEBSITES
     )
-    target = args.target
+    patterns = PatternSet(split_targets(args.target, DEFAULT_TARGET))
     today = datetime.now().strftime("%Y-%m-%d")
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -231,7 +677,7 @@ def main():
     print(f"{'=' * 60}")
     print(f"  Website Silver URL Scanner")
     print(f"{'=' * 60}")
-    print(f"  Target  : {target}")
+    print(f"  Targets : {patterns}")
     print(f"  Sites   : {len(websites)}")
     print(f"{'=' * 60}")
 
@@ -243,47 +689,64 @@ def main():
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     }
 
-    with httpx.Client(headers=headers, timeout=20) as client:
-        for url in websites:
-            findings = scan_website(client, url, target)
-            if findings:
-                all_findings[url] = findings
-                total_matches += len(findings)
-            else:
-                print(f"  ✅ No Silver references found.")
+    store = None if args.no_cache else StateStore("website_bundles", version=BUNDLE_STATE_VERSION)
+    results, bundle_stats = asyncio.run(
+        scan_websites(
+            websites,
+            patterns,
+            headers,
+            max(1, args.concurrency),
+            max(1, args.per_host),
+            store,
+            args.chunk_depth,
+            args.chunk_budget * 1024 * 1024,
+        )
+    )
+    for url, findings in results.items():
+        if findings:
+            all_findings[url] = findings
+            total_matches += len(findings)
 
     # ── Console summary ───────────────────────────────────────────────────────
     print(f"\n{'=' * 60}")
     print(f"  RESULTS  ({total_matches} match{'es' if total_matches != 1 else ''})")
     print(f"{'=' * 60}")
+    print(
+        f"  JS bundles: {bundle_stats['fetched']} downloaded, "
+        f"{bundle_stats['not_modified']} unchanged since last run, "
+        f"{bundle_stats['reused']} shared between sites, "
+        f"{bundle_stats['scanned']} scanned"
+    )
     for url, findings in all_findings.items():
         print(f"\n🌐 {url}")
         for f in findings:
-            print(f"  └─ {f['matched_url']}")
+            print(f"  └─ {f['matched_url']}  [{', '.join(f['patterns'])}]")
 
     # ── Markdown report ───────────────────────────────────────────────────────
     md_lines = [
         f"# Website Silver Cluster URL Scan",
         "",
         f"**Generated:** {today}  ",
-        f"**Target Pattern:** `{target}`  ",
+        f"**Target Patterns:** {', '.join(f'`{p}`' for p in patterns.patterns)}  ",
         f"**Sites Scanned:** {len(websites)} | **Total Matches:** {total_matches}",
         "",
         "---",
         "",
         "## Summary",
         "",
-        "| Website | Matched URL | Source |",
-        "|:--------|:------------|:-------|",
+        "| Website | Matched URL | Pattern | Source |",
+        "|:--------|:------------|:--------|:-------|",
     ]
 
     for url in websites:
         for f in all_findings.get(url, []):
             source_short = f["source"].replace(url, "").strip() or "[HTML]"
-            md_lines.append(f"| {url} | `{f['matched_url']}` | {source_short} |")
+            md_lines.append(
+                f"| {url} | `{f['matched_url']}` | {', '.join(f['patterns'])} | {source_short} |"
+            )
 
     if not any(all_findings.get(u) for u in websites):
-        md_lines.append("| — | *No matches found* | — |")
+        md_lines.append("| — | *No matches found* | — | — |")
 
     md_lines += ["", "---", "", "## Per-Site Detail", ""]
 
@@ -295,14 +758,14 @@ def main():
             continue
 
         md_lines += [
-            "| Source | Matched URL | Context |",
-            "|:-------|:------------|:--------|",
+            "| Source | Matched URL | Pattern | Context |",
+            "|:-------|:------------|:--------|:--------|",
         ]
         for f in findings:
             source_short = f["source"].replace(url, "").strip() or "[HTML]"
             ctx_escaped = f["context"].replace("|", "\\|")[:150]
             md_lines.append(
-                f"| {source_short} | `{f['matched_url']}` | `{ctx_escaped}` |"
+                f"| {source_short} | `{f['matched_url']}` | {', '.join(f['patterns'])} | `{ctx_escaped}` |"
             )
         md_lines.append("")
 
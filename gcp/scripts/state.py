@@ -0,0 +1,62 @@
+"""
+Versioned JSON state persisted between scanner runs.
+
+Incremental scanners keep per-item results (plus whatever they use to detect
+change, e.g. `pushed_at` and the HEAD tree SHA, or a 1Password item version)
+under output/.cache/state/<name>.json. The stored version is checked on load:
+a scanner bumps its version when the shape or meaning of its entries changes,
+and stale state is then ignored instead of being merged into reports.
+
+The on-disk caches in github_client share CACHE_ROOT and write_atomic.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+CACHE_ROOT = Path(__file__).resolve().parent / "output" / ".cache"
+CACHE_DIR = CACHE_ROOT / "state"
+
+
+def write_atomic(path: Path, text: str):
+    """Write `text` to `path` via a temp file + rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+class StateStore:
+    """A named, versioned {key: entry} document on disk."""
+
+    def __init__(self, name: str, version: int = 1, root: Path = CACHE_DIR):
+        self.path = Path(root) / f"{name}.json"
+        self.version = version
+
+    def load(self) -> dict:
+        """Return the stored entries, or {} if missing, unreadable or from another version."""
+        try:
+            doc = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(doc, dict) or doc.get("version") != self.version:
+            return {}
+        return doc.get("entries") or {}
+
+    def save(self, entries: dict):
+        """Replace the stored entries atomically."""
+        doc = {
+            "version": self.version,
+            "saved_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "entries": entries,
+        }
+        write_atomic(self.path, json.dumps(doc, indent=1, sort_keys=True))
@@ -6,6 +6,8 @@ from collections import defaultdict
 import requests
 from dotenv import load_dotenv
 
+from github_client import GitHubClient, MaxRetriesExceededError
+
 load_dotenv()
 
 GITHUB_TOKEN = os.getenv("CODEQL_GITHUB_TOKEN")
@@ -13,11 +15,6 @@ GITHUB_TOKEN = os.getenv("CODEQL_GITHUB_TOKEN")
 if not GITHUB_TOKEN:
     raise ValueError("CODEQL_GITHUB_TOKEN is not set in .env")
 
-HEADERS = {
-    "Authorization": f"token {GITHUB_TOKEN}",
-    "Accept": "application/vnd.github.v3+json",
-}
-
 # Patterns that may indicate bot or spam accounts
 SUSPICIOUS_PATTERNS = [
     r"I can (own|take|handle|work on) this",
@@ -29,19 +26,11 @@ SUSPICIOUS_PATTERNS = [
 
 SINCE_DATE = "2026-01-01T00:00:00Z"
 
+# Pooled, throttled client; listings are revalidated with ETags (304s are free)
+GITHUB = GitHubClient(GITHUB_TOKEN)
 
-# ── Utility functions ──────────────────────────────────────────────────
 
-
-def get_paginated(url):
-    """Fetch all pages from a paginated GitHub API endpoint."""
-    results = []
-    while url:
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
-        results.extend(response.json())
-        url = response.links.get("next", {}).get("url")
-    return results
+# ── Utility functions ──────────────────────────────────────────────────
 
 
 def is_suspicious(text):
@@ -61,7 +50,7 @@ def issue_number_from_url(api_url):
 def get_repo_collaborators(owner, repo):
     """Get list of collaborator logins for a repo."""
     url = f"https://api.github.com/repos/{owner}/{repo}/collaborators"
-    return [m["login"] for m in get_paginated(url)]
+    return [m["login"] for m in GITHUB.paginate(url)]
 
 
 # ── Check 1: Non-collaborator issue comments ──────────────────────────
@@ -82,7 +71,7 @@ def check_issue_comments(owner, repo):
         f"https://api.github.com/repos/{owner}/{repo}"
         f"/issues/comments?since={SINCE_DATE}"
     )
-    comments = get_paginated(comments_url)
+    comments = GITHUB.paginate(comments_url)
     print(f"  Found {len(comments)} total comments.\n")
 
     # Group by non-collaborator author
@@ -159,7 +148,7 @@ def check_pr_authors():
     # Get all repos the authenticated user has admin/push access to
     print("  Fetching your managed repos...")
     repos_url = "https://api.github.com/user/repos?type=all&sort=updated&per_page=100"
-    all_repos = get_paginated(repos_url)
+    all_repos = GITHUB.paginate(repos_url)
 
     # Filter to bcgov repos where the user has admin or maintain permission
     managed_repos = [
@@ -188,7 +177,7 @@ def check_pr_authors():
         if full_name not in collaborator_cache:
             try:
                 collaborator_cache[full_name] = get_repo_collaborators(owner, name)
-            except requests.exceptions.HTTPError:
+            except (requests.RequestException, MaxRetriesExceededError):
                 # Skip repos where we can't list collaborators
                 continue
 
@@ -200,10 +189,7 @@ def check_pr_authors():
                 f"https://api.github.com/repos/{full_name}/pulls"
                 f"?state=all&sort=created&direction=desc&per_page=100"
             )
-            while prs_url:
-                resp = requests.get(prs_url, headers=HEADERS)
-                resp.raise_for_status()
-                page_prs = resp.json()
+            for page_prs in GITHUB.iter_pages(prs_url):
                 past_cutoff = False
                 for pr in page_prs:
                     if pr["created_at"] < SINCE_DATE:
@@ -226,8 +212,7 @@ def check_pr_authors():
                         )
                 if past_cutoff or not page_prs:
                     break
-                prs_url = resp.links.get("next", {}).get("url")
-        except requests.exceptions.HTTPError:
+        except (requests.RequestException, MaxRetriesExceededError):
             continue
 
     sys.stdout.write("\r" + " " * 80 + "\r")
@@ -269,4 +254,5 @@ def check_pr_authors():
 if __name__ == "__main__":
     check_issue_comments("bcgov", "entity")
     check_pr_authors()
+    print(f"GitHub listings: {GITHUB.http_cache.summary()}")
     print("Done.")
@@ -4,9 +4,16 @@ Scan all managed bcgov repos for tech stacks and dependency versions.
 Focuses on Python, Node.js, Nuxt, Vue, and their major dependencies.
 Handles monolithic repos by scanning subdirectories for dependency files.
 Marks end-of-life (EOL) versions and exports results to CSV.
+Dependency file contents are cached on disk by blob SHA between runs, and
+repo listings and trees are revalidated with ETags. With --graphql, uncached
+dependency files across all repos are fetched in batched GraphQL queries.
+
+Usage:
+    uv run tech_stacks.py
+    uv run tech_stacks.py --graphql
 """
 
-import base64
+import argparse
 import csv
 import json
 import os
@@ -18,19 +25,18 @@ from datetime import datetime
 import requests
 from dotenv import load_dotenv
 
+from github_client import GitHubClient, MaxRetriesExceededError
+
 load_dotenv()
 
 GITHUB_TOKEN = os.getenv("CODEQL_GITHUB_TOKEN")
 if not GITHUB_TOKEN:
     raise ValueError("CODEQL_GITHUB_TOKEN is not set in .env")
 
-HEADERS = {
-    "Authorization": f"token {GITHUB_TOKEN}",
-    "Accept": "application/vnd.github.v3+json",
-}
 
 TODAY = datetime.now().strftime("%Y-%m-%d")
 OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+GITHUB = GitHubClient(GITHUB_TOKEN)
 
 # ── EOL definitions ───────────────────────────────────────────────────
 # Format: package -> list of (max_major, max_minor_or_None, eol_date, note)
@@ -200,42 +206,6 @@ NODE_KEY_DEPS = [
 ]
 
 
-# ── GitHub API helpers ────────────────────────────────────────────────
-
-
-def get_paginated(url):
-    """Fetch all pages from a paginated GitHub API endpoint."""
-    results = []
-    while url:
-        resp = requests.get(url, headers=HEADERS)
-        resp.raise_for_status()
-        results.extend(resp.json())
-        url = resp.links.get("next", {}).get("url")
-    return results
-
-
-def get_file_content(owner, repo, path):
-    """Fetch and decode a file from the GitHub API."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-    resp = requests.get(url, headers=HEADERS)
-    if resp.status_code != 200:
-        return None
-    data = resp.json()
-    if data.get("encoding") == "base64":
-        return base64.b64decode(data["content"]).decode("utf-8", errors="replace")
-    return None
-
-
-def get_repo_tree(owner, repo):
-    """Get the full file tree for a repo (recursive)."""
-    url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/HEAD?recursive=1"
-    resp = requests.get(url, headers=HEADERS)
-    if resp.status_code != 200:
-        return []
-    data = resp.json()
-    return [item["path"] for item in data.get("tree", []) if item["type"] == "blob"]
-
-
 # ── Dependency file parsing ───────────────────────────────────────────
 
 
@@ -346,18 +316,67 @@ def get_subproject_name(path):
 # ── Repo scanning ────────────────────────────────────────────────────
 
 
+def is_parsed(path):
+    """True for dependency files whose contents scan_repo actually parses."""
+    basename = os.path.basename(path)
+    return path.endswith(".txt") or basename in ("pyproject.toml", "package.json")
+
+
 def scan_repo(owner, repo):
     """Scan a repo for tech stacks. Returns structured results."""
-    results = {"python": [], "node": []}
-
-    tree = get_repo_tree(owner, repo)
+    _, tree = GITHUB.get_repo_tree(owner, repo)
     if not tree:
-        return results
+        return {"python": [], "node": []}
 
     dep_files = find_dep_files(tree)
+    contents = {
+        path: GITHUB.get_file_content(owner, repo, path, tree[path])
+        for path in dep_files["python"] + dep_files["node"]
+        if is_parsed(path)
+    }
+    return analyze_dep_files(dep_files, contents)
+
+
+def scan_repos_graphql(managed_repos):
+    """Scan all repos, fetching uncached dependency files in batched GraphQL queries."""
+    trees = {}
+    for i, repo in enumerate(managed_repos, 1):
+        full_name = repo["full_name"]
+        sys.stdout.write(
+            f"\r  Fetching trees [{i}/{len(managed_repos)}] {full_name}...".ljust(80)
+        )
+        sys.stdout.flush()
+        _, trees[full_name] = GITHUB.get_repo_tree(*full_name.split("/"))
+    sys.stdout.write("\r" + " " * 80 + "\r")
+
+    dep_files = {name: find_dep_files(tree) for name, tree in trees.items()}
+    files = [
+        (*name.split("/"), path, trees[name][path])
+        for name, found in dep_files.items()
+        for path in found["python"] + found["node"]
+        if is_parsed(path)
+    ]
+    contents = GITHUB.fetch_files(files)
+
+    all_results = {}
+    for name, found in dep_files.items():
+        owner, repo = name.split("/")
+        repo_contents = {
+            path: contents.get((owner, repo, path))
+            for path in found["python"] + found["node"]
+        }
+        results = analyze_dep_files(found, repo_contents)
+        if results["python"] or results["node"]:
+            all_results[name] = results
+    return all_results
+
+
+def analyze_dep_files(dep_files, contents):
+    """Parse fetched dependency files ({path: text}) into structured results."""
+    results = {"python": [], "node": []}
 
     for path in dep_files["python"]:
-        content = get_file_content(owner, repo, path)
+        content = contents.get(path)
         if not content:
             continue
         basename = os.path.basename(path)
@@ -378,7 +397,7 @@ def scan_repo(owner, repo):
             )
 
     for path in dep_files["node"]:
-        content = get_file_content(owner, repo, path)
+        content = contents.get(path)
         if not content:
             continue
         info = parse_package_json(content)
@@ -569,10 +588,18 @@ def export_markdown(rows, filename):
 # ── Main ──────────────────────────────────────────────────────────────
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan managed bcgov repos for tech stacks")
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="Fetch dependency files in batched GraphQL queries instead of one REST call each",
+    )
+    args = parser.parse_args(argv)
+
     print("Fetching managed bcgov repos...")
     repos_url = "https://api.github.com/user/repos?type=all&sort=updated&per_page=100"
-    all_repos = get_paginated(repos_url)
+    all_repos = GITHUB.paginate(repos_url)
 
     managed_repos = [
         r
@@ -587,24 +614,29 @@ def main():
     print(f"Found {len(managed_repos)} active managed bcgov repos.\n")
 
     all_results = {}
-    for i, repo in enumerate(managed_repos, 1):
-        full_name = repo["full_name"]
-        owner, name = full_name.split("/")
-        sys.stdout.write(
-            f"\r  Scanning [{i}/{len(managed_repos)}] {full_name}...".ljust(80)
-        )
-        sys.stdout.flush()
-
-        try:
-            results = scan_repo(owner, name)
-            if results["python"] or results["node"]:
-                all_results[full_name] = results
-        except requests.exceptions.HTTPError as e:
-            sys.stdout.write(f"\r  ⚠️  Error scanning {full_name}: {e}".ljust(80) + "\n")
-            continue
+    if args.graphql:
+        all_results = scan_repos_graphql(managed_repos)
+    else:
+        for i, repo in enumerate(managed_repos, 1):
+            full_name = repo["full_name"]
+            owner, name = full_name.split("/")
+            sys.stdout.write(
+                f"\r  Scanning [{i}/{len(managed_repos)}] {full_name}...".ljust(80)
+            )
+            sys.stdout.flush()
+
+            try:
+                results = scan_repo(owner, name)
+                if results["python"] or results["node"]:
+                    all_results[full_name] = results
+            except (requests.RequestException, MaxRetriesExceededError) as e:
+                sys.stdout.write(f"\r  ⚠️  Error scanning {full_name}: {e}".ljust(80) + "\n")
+                continue
 
     sys.stdout.write("\r" + " " * 80 + "\r")
     sys.stdout.flush()
+    print(f"  Dependency files: {GITHUB.blob_cache.summary()}")
+    print(f"  Listings & trees: {GITHUB.http_cache.summary()}")
 
     # Build flat rows for output
     rows = build_rows(all_results)
@@ -0,0 +1,53 @@
+"""
+Tests for ignore_rules.py.
+
+Usage:
+    uv run --with pytest pytest test_ignore_rules.py
+"""
+
+import pytest
+
+from ignore_rules import IgnoreRules
+
+
+def test_regex_scope_does_not_cross_into_next_field():
+    rules = IgnoreRules.from_dicts([{"id": "prod", "project": "re:[^/]*-prod"}])
+    assert rules.match("a083gt-dev", "svc-prod", "API_URL", "https://x") is None
+    assert rules.match("a083gt-prod", "svc", "API_URL", "https://x").id == "prod"
+
+
+def test_regex_whitespace_does_not_join_key_and_value():
+    rules = IgnoreRules.from_dicts([{"id": "url", "key": r"re:URL\s+silver"}])
+    assert rules.match("p", "s", "MY_URL", "silver.devops.gov.bc.ca") is None
+
+
+def test_regex_anchors_apply_to_the_field():
+    rules = IgnoreRules.from_dicts([{"id": "svc", "service": r"re:\Anamex-.*\Z"}])
+    assert rules.match("p", "namex-api", "K", "v").id == "svc"
+    assert rules.match("p", "old-namex-api", "K", "v") is None
+
+
+def test_negated_glob_class_stays_in_field():
+    rules = IgnoreRules.from_dicts([{"id": "g", "key": "glob:API[!_]"}])
+    assert rules.match("p", "s", "API", "x") is None
+    assert rules.match("p", "s", "APIX", "x").id == "g"
+
+
+def test_first_applicable_rule_wins_after_a_false_candidate():
+    rules = IgnoreRules.from_dicts([
+        {"id": "regex", "key": "API", "project": "re:-prod$"},
+        {"id": "substring", "key": "API"},
+    ])
+    assert rules.match("a-dev", "svc-prod", "API_URL", "v").id == "substring"
+    assert rules.match("a-prod", "svc", "API_URL", "v").id == "regex"
+
+
+def test_value_rules_skipped_without_value():
+    rules = IgnoreRules.from_dicts([{"id": "v", "value": "minio"}, {"id": "k", "key": "SECRET"}])
+    assert rules.match("p", "s", "MINIO_URL") is None
+    assert rules.match("p", "s", "DB_SECRET").id == "k"
+
+
+def test_bad_regex_names_the_rule():
+    with pytest.raises(ValueError, match="rule 'broken'"):
+        IgnoreRules.from_dicts([{"id": "broken", "key": "re:("}])